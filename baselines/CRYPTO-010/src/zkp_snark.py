@@ -2,7 +2,37 @@
 import hashlib
 import secrets
 from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+
+# Gate opcodes used by the flattened circuit representation
+OP_MUL = 0
+OP_ADD = 1
+OP_AND = 2
+OP_OR = 3
+OP_UNKNOWN = -1
+
+GATE_OPCODES = {"mul": OP_MUL, "add": OP_ADD, "and": OP_AND, "or": OP_OR}
+
+# Hash used for the recursive-proof aggregation (not part of the per-proof protocol)
+AGGREGATION_HASH = "blake3" if BLAKE3_AVAILABLE else "sha256"
+
+
+def new_aggregation_hasher(algorithm: str = AGGREGATION_HASH):
+    """Create a hasher for the recursive-proof combined hash"""
+    if algorithm == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise ValueError("blake3 is not installed")
+        return blake3.blake3()
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    raise ValueError(f"Unsupported aggregation hash: {algorithm}")
 
 
 @dataclass
@@ -12,6 +42,37 @@ class Circuit:
     wires: Dict[str, int]
     public_inputs: List[str]
     constraints: List[Tuple[str, str, str]]  # (left, right, output)
+    # Flattened gate table over wire indices (built once in __post_init__)
+    wire_names: List[str] = field(init=False, repr=False)
+    op_types: List[int] = field(init=False, repr=False)
+    lhs: List[int] = field(init=False, repr=False)
+    rhs: List[int] = field(init=False, repr=False)
+    out: List[int] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        """Flatten gates into parallel opcode / wire-index lists"""
+        wire_index = dict(self.wires)
+        next_index = max(wire_index.values(), default=-1) + 1
+        
+        # Wires referenced by gates but missing from the wire map get fresh slots
+        for gate in self.gates:
+            for name in (*gate["inputs"], gate["output"]):
+                if name not in wire_index:
+                    wire_index[name] = next_index
+                    next_index += 1
+        
+        self.wire_names = [""] * next_index
+        for name, idx in wire_index.items():
+            self.wire_names[idx] = name
+        
+        self.op_types = [GATE_OPCODES.get(g["type"], OP_UNKNOWN) for g in self.gates]
+        self.lhs = [wire_index[g["inputs"][0]] for g in self.gates]
+        self.rhs = [wire_index[g["inputs"][1]] for g in self.gates]
+        self.out = [wire_index[g["output"]] for g in self.gates]
+    
+    def wire_slots(self) -> Dict[str, int]:
+        """Get mapping from wire name to its slot in the flattened wire state"""
+        return {name: idx for idx, name in enumerate(self.wire_names) if name}
 
 
 class SimplifiedSNARK:
@@ -78,30 +139,25 @@ class SimplifiedSNARK:
         if not self.trusted_setup_done:
             self.trusted_setup(circuit)
         
-        # Evaluate circuit with witness
-        wire_values = {}
-        for wire_name, wire_idx in circuit.wires.items():
-            if wire_name in witness:
-                wire_values[wire_name] = witness[wire_name]
+        # Evaluate circuit with witness over the flattened wire state
+        wire_state = self._load_witness(circuit, witness)
+        op_types, lhs, rhs, out = circuit.op_types, circuit.lhs, circuit.rhs, circuit.out
         
         # Process gates
-        for gate in circuit.gates:
-            if gate["type"] == "mul":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = left * right
-            elif gate["type"] == "add":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = left + right
-            elif gate["type"] == "and":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = int(bool(left) and bool(right))
-            elif gate["type"] == "or":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = int(bool(left) or bool(right))
+        for i in range(len(op_types)):
+            op = op_types[i]
+            left = wire_state[lhs[i]]
+            right = wire_state[rhs[i]]
+            if op == OP_MUL:
+                wire_state[out[i]] = left * right
+            elif op == OP_ADD:
+                wire_state[out[i]] = left + right
+            elif op == OP_AND:
+                wire_state[out[i]] = int(bool(left) and bool(right))
+            elif op == OP_OR:
+                wire_state[out[i]] = int(bool(left) or bool(right))
+        
+        wire_values = {name: value for name, value in zip(circuit.wire_names, wire_state) if name}
         
         # Generate proof commitments (simplified)
         # In real SNARKs, this involves polynomial evaluations and commitments
@@ -171,26 +227,28 @@ class SimplifiedSNARK:
     ) -> List[Any]:
         """Extract public inputs from witness"""
         # Evaluate circuit to get public input values
-        wire_values = {}
-        
-        # Initialize with witness values
-        for wire_name in circuit.wires:
-            if wire_name in witness:
-                wire_values[wire_name] = witness[wire_name]
+        wire_state = self._load_witness(circuit, witness)
+        op_types, lhs, rhs, out = circuit.op_types, circuit.lhs, circuit.rhs, circuit.out
         
         # Process gates to compute derived values
-        for gate in circuit.gates:
-            if gate["type"] == "mul":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = left * right
-            elif gate["type"] == "add":
-                left = wire_values.get(gate["inputs"][0], 0)
-                right = wire_values.get(gate["inputs"][1], 0)
-                wire_values[gate["output"]] = left + right
+        for i in range(len(op_types)):
+            op = op_types[i]
+            if op == OP_MUL:
+                wire_state[out[i]] = wire_state[lhs[i]] * wire_state[rhs[i]]
+            elif op == OP_ADD:
+                wire_state[out[i]] = wire_state[lhs[i]] + wire_state[rhs[i]]
         
         # Extract public inputs
-        return [wire_values.get(pi, 0) for pi in circuit.public_inputs]
+        slots = circuit.wire_slots()
+        return [wire_state[slots[pi]] if pi in slots else 0 for pi in circuit.public_inputs]
+    
+    def _load_witness(self, circuit: Circuit, witness: Dict[str, Any]) -> List[Any]:
+        """Build the initial wire state from witness values (unset wires are 0)"""
+        wire_state: List[Any] = [0] * len(circuit.wire_names)
+        for idx, wire_name in enumerate(circuit.wire_names):
+            if wire_name in witness:
+                wire_state[idx] = witness[wire_name]
+        return wire_state
     
     def get_verification_key(self, circuit: Circuit) -> str:
         """Get verification key for circuit"""
@@ -215,7 +273,7 @@ class RecursiveSNARK:
             raise ValueError("Number of proofs must match number of circuits")
         
         # Combine proofs (simplified)
-        combined_commitment = hashlib.sha256()
+        combined_commitment = new_aggregation_hasher()
         
         for proof in proofs:
             combined_commitment.update(proof["pi_a"].encode())
@@ -226,6 +284,7 @@ class RecursiveSNARK:
         aggregated_proof = {
             "num_proofs": len(proofs),
             "combined_hash": combined_commitment.hexdigest(),
+            "hash_algorithm": AGGREGATION_HASH,
             "individual_proofs": proofs,
             "proof_type": "recursive"
         }
@@ -252,19 +311,32 @@ class RecursiveSNARK:
             if len(verification_keys) != num_proofs:
                 return False
             
-            # Verify each individual proof
-            for proof, public_inputs, vk in zip(
-                individual_proofs, public_inputs_list, verification_keys
-            ):
-                if not self.base_snark.verify(proof, public_inputs, vk):
-                    return False
+            # Verify each individual proof and stream the combined hash in one pass.
+            # SimplifiedSNARK.verify is a pure structural check, so it is inlined
+            # here rather than re-dispatched per proof.
+            combined_commitment = new_aggregation_hasher(
+                recursive_proof.get("hash_algorithm", "sha256")
+            )
+            sha256 = hashlib.sha256
             
-            # Verify combined hash
-            combined_commitment = hashlib.sha256()
-            for proof in individual_proofs:
-                combined_commitment.update(proof["pi_a"].encode())
-                combined_commitment.update(proof["pi_b"].encode())
-                combined_commitment.update(proof["pi_c"].encode())
+            for proof, public_inputs in zip(individual_proofs, public_inputs_list):
+                if proof.get("public_signals", []) != public_inputs:
+                    return False
+                
+                pi_a = proof["pi_a"].encode()
+                pi_b = proof["pi_b"].encode()
+                pi_c = proof["pi_c"].encode()
+                
+                expected_c = sha256(pi_a + b"|" + pi_b + b"|").hexdigest()[:16].encode()
+                if (
+                    len(pi_a) != 64 or len(pi_b) != 64 or len(pi_c) != 64
+                    or not pi_c.startswith(expected_c)
+                ):
+                    return False
+                
+                combined_commitment.update(pi_a)
+                combined_commitment.update(pi_b)
+                combined_commitment.update(pi_c)
             
             expected_hash = combined_commitment.hexdigest()
             
@@ -0,0 +1,93 @@
+"""Bounded LRU storage for ciphertexts"""
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+from fhe_operations import FHECiphertext, LIMB_BITS
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the in-memory footprint of a stored entry in bytes"""
+    if isinstance(value, FHECiphertext):
+        n = value.data.shape[1]
+        # Include the limb spectra that multiply/decrypt may cache later
+        num_limbs = -(-63 // LIMB_BITS)
+        spectra = 2 * num_limbs * (n + 1) * np.dtype(np.complex128).itemsize
+        return value.data.nbytes + spectra
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    if hasattr(value, "bit_length") and not isinstance(value, bool):
+        # Python int or gmpy2 mpz
+        return (value.bit_length() + 7) // 8
+    return sys.getsizeof(value)
+
+
+class CiphertextStore(MutableMapping):
+    """Ciphertext storage bounded by a byte budget with LRU eviction"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up and touch an entry in one step, so eviction cannot race it"""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key: str, value: Any):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+
+            # Evict least recently used entries, always keeping the newest one
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        # Membership checks do not count as use
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        del self._entries[key]
+        self.total_bytes -= self._sizes.pop(key)
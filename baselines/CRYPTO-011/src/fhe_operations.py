@@ -1,9 +1,144 @@
 """Fully Homomorphic Encryption Operations (Simplified)"""
 import numpy as np
-from typing import List, Tuple, Optional, Any, Dict
-from dataclasses import dataclass
+from typing import List, Tuple, Optional, Any, Dict, Iterable, Sequence, Union
+from dataclasses import dataclass, field
 import secrets
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Bit width of the limbs used for exact polynomial multiplication. Limb
+# convolutions are computed with a float64 FFT; limbs this narrow keep every
+# product coefficient far below 2^53, so rounding recovers it exactly.
+LIMB_BITS = 12
+
+# Bound on limb-product coefficient magnitudes for exact FFT rounding
+FFT_EXACT_BOUND = 2 ** 45
+
+# Number of plaintexts encrypted per vectorized batch step
+ENCRYPT_CHUNK_SIZE = 64
+
+
+def sample_centered(coeffs_range: int, shape) -> np.ndarray:
+    """Sample int64 coefficients uniformly from [-range/2, range/2) with a CSPRNG"""
+    count = int(np.prod(shape))
+    # Rejection sampling removes the modulo bias of 64-bit words
+    limit = (1 << 64) - ((1 << 64) % coeffs_range)
+    words = np.empty(0, dtype=np.uint64)
+    while words.size < count:
+        fresh = np.frombuffer(secrets.token_bytes(8 * count), dtype=np.uint64)
+        if limit < (1 << 64):
+            fresh = fresh[fresh < np.uint64(limit)]
+        words = np.concatenate([words, fresh])
+    
+    values = (words[:count] % np.uint64(coeffs_range)).astype(np.int64)
+    return (values - coeffs_range // 2).reshape(shape)
+
+
+def to_limbs(poly: np.ndarray, modulus: int) -> np.ndarray:
+    """Split a polynomial into LIMB_BITS-wide limbs of shape (..., limbs, n)
+    
+    Polynomials whose coefficients already fit in one signed limb (secret
+    keys, encryption randomness) are kept as a single signed limb.
+    """
+    poly = np.asarray(poly, dtype=np.int64)
+    if np.abs(poly).max(initial=0) < (1 << LIMB_BITS):
+        return poly[..., np.newaxis, :]
+    
+    poly = poly % modulus
+    num_limbs = max(1, -(-modulus.bit_length() // LIMB_BITS))
+    mask = (1 << LIMB_BITS) - 1
+    return np.stack([(poly >> (LIMB_BITS * i)) & mask for i in range(num_limbs)], axis=-2)
+
+
+def limb_spectrum(limbs: np.ndarray) -> np.ndarray:
+    """Forward FFT of limbs zero-padded to the linear convolution length"""
+    return np.fft.rfft(limbs, 2 * limbs.shape[-1], axis=-1)
+
+
+def spectral_multiply(spec_a: np.ndarray, spec_b: np.ndarray, n: int, modulus: int) -> np.ndarray:
+    """Multiply polynomials in Z_q[X]/(X^n + 1) given their limb spectra
+    
+    Spectra have shape (..., limbs, n + 1) and broadcast over leading axes.
+    """
+    la, lb = spec_a.shape[-2], spec_b.shape[-2]
+    if min(la, lb) * n * (1 << (2 * LIMB_BITS)) >= FFT_EXACT_BOUND:
+        raise ValueError("Ring dimension too large for exact FFT multiplication")
+    
+    # Group limb products by weight 2^(LIMB_BITS * k); the transform is
+    # linear, so each group needs a single inverse FFT
+    lead = np.broadcast_shapes(spec_a.shape[:-2], spec_b.shape[:-2])
+    groups = np.zeros(lead + (la + lb - 1, n + 1), dtype=np.complex128)
+    for i in range(la):
+        groups[..., i:i + lb, :] += spec_a[..., i:i + 1, :] * spec_b
+    
+    return _reduce_groups(groups, n, modulus)
+
+
+def spectral_inner_product(pairs: Iterable[Tuple[np.ndarray, np.ndarray]], n: int, modulus: int) -> np.ndarray:
+    """Sum of polynomial products over pairs of limb spectra, modulo q
+    
+    Products are accumulated in the transform domain and only brought back
+    once per block, with blocks as wide as the exact FFT bound allows.
+    """
+    max_limbs = max(1, -(-modulus.bit_length() // LIMB_BITS))
+    block_size = (FFT_EXACT_BOUND - 1) // (max_limbs * n * (1 << (2 * LIMB_BITS)))
+    if block_size < 1:
+        raise ValueError("Ring dimension too large for exact FFT multiplication")
+    
+    result = None
+    groups = None
+    pending = 0
+    for spec_a, spec_b in pairs:
+        la, lb = spec_a.shape[-2], spec_b.shape[-2]
+        if groups is None:
+            lead = np.broadcast_shapes(spec_a.shape[:-2], spec_b.shape[:-2])
+            groups = np.zeros(lead + (2 * max_limbs - 1, n + 1), dtype=np.complex128)
+        for i in range(la):
+            groups[..., i:i + lb, :] += spec_a[..., i:i + 1, :] * spec_b
+        pending += 1
+        
+        if pending == block_size:
+            block = _reduce_groups(groups, n, modulus)
+            result = block if result is None else (result + block) % modulus
+            groups[...] = 0
+            pending = 0
+    
+    if groups is None:
+        raise ValueError("Inner product of empty sequences")
+    if pending:
+        block = _reduce_groups(groups, n, modulus)
+        result = block if result is None else (result + block) % modulus
+    return result
+
+
+def _reduce_groups(groups: np.ndarray, n: int, modulus: int) -> np.ndarray:
+    """Inverse transform grouped limb products and reduce them modulo X^n + 1 and q"""
+    full = np.rint(np.fft.irfft(groups, 2 * n, axis=-1)).astype(np.int64)
+    
+    # Reduction by X^n + 1
+    folded = full[..., :n] - full[..., n:]
+    folded %= modulus
+    
+    return _recombine_limbs(folded, modulus)
+
+
+def _recombine_limbs(folded: np.ndarray, modulus: int) -> np.ndarray:
+    """Combine per-weight limb sums (..., k, n) into coefficients modulo q"""
+    weights = [pow(2, LIMB_BITS * k, modulus) for k in range(folded.shape[-2])]
+    
+    if modulus & (modulus - 1) == 0 and modulus <= 2 ** 63:
+        # Power-of-two modulus: uint64 wraparound is exact modulo q
+        acc = np.zeros(folded.shape[:-2] + folded.shape[-1:], dtype=np.uint64)
+        for k, weight in enumerate(weights):
+            acc += folded[..., k, :].astype(np.uint64) * np.uint64(weight)
+        return (acc & np.uint64(modulus - 1)).astype(np.int64)
+    
+    acc = np.zeros(folded.shape[:-2] + folded.shape[-1:], dtype=object)
+    for k, weight in enumerate(weights):
+        acc = (acc + folded[..., k, :].astype(object) * weight) % modulus
+    return acc.astype(np.int64)
 
 
 @dataclass
@@ -19,14 +154,25 @@ class FHEParameters:
 @dataclass
 class FHECiphertext:
     """FHE ciphertext representation"""
-    c0: np.ndarray  # First polynomial
-    c1: np.ndarray  # Second polynomial
+    data: np.ndarray  # Contiguous (2, n) int64 array: rows are c0 and c1
     level: int  # Current level (for leveled FHE)
     scale: float  # Scaling factor for CKKS
+    # Limb spectra of both rows, filled in on first use by multiply/decrypt
+    ntt_cache: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def c0(self) -> np.ndarray:
+        """First polynomial"""
+        return self.data[0]
+    
+    @property
+    def c1(self) -> np.ndarray:
+        """Second polynomial"""
+        return self.data[1]
     
     def size(self) -> int:
         """Get ciphertext size"""
-        return len(self.c0) + len(self.c1)
+        return self.data.size
 
 
 @dataclass
@@ -59,13 +205,11 @@ class SimplifiedBFV:
         self.public_key: Optional[FHEPublicKey] = None
         self.secret_key: Optional[FHESecretKey] = None
         self.eval_key: Optional[EvaluationKey] = None
+        self._key_spectra: Dict[int, Tuple[Any, ...]] = {}
     
     def generate_polynomial(self, coeffs_range: int) -> np.ndarray:
         """Generate random polynomial with coefficients in range"""
-        return np.array([
-            secrets.randbelow(coeffs_range) - coeffs_range // 2
-            for _ in range(self.params.dimension)
-        ])
+        return sample_centered(coeffs_range, self.params.dimension)
     
     def generate_error(self) -> np.ndarray:
         """Generate error polynomial from Gaussian distribution"""
@@ -73,19 +217,30 @@ class SimplifiedBFV:
     
     def polynomial_multiply(self, a: np.ndarray, b: np.ndarray, modulus: int) -> np.ndarray:
         """Multiply polynomials in ring Z_q[X]/(X^n + 1)"""
-        # Simplified multiplication (not optimized)
-        n = len(a)
-        result = np.zeros(n, dtype=np.int64)
-        
-        for i in range(n):
-            for j in range(n):
-                if i + j < n:
-                    result[i + j] = (result[i + j] + a[i] * b[j]) % modulus
-                else:
-                    # Reduction by X^n + 1
-                    result[i + j - n] = (result[i + j - n] - a[i] * b[j]) % modulus
-        
-        return result
+        # Coefficients up to q ~ 2^60 would overflow int64 when multiplied
+        # directly, so the product is formed from exact limb convolutions
+        return spectral_multiply(
+            limb_spectrum(to_limbs(a, modulus)),
+            limb_spectrum(to_limbs(b, modulus)),
+            len(a), modulus
+        )
+    
+    def _cached_spectra(self, key: Any, *polys: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Limb spectra of key polynomials, computed once per key object"""
+        cached = self._key_spectra.get(id(key))
+        if cached is None or cached[0] is not key:
+            q = self.params.ciphertext_modulus
+            cached = (key,) + tuple(limb_spectrum(to_limbs(p, q)) for p in polys)
+            self._key_spectra[id(key)] = cached
+        return cached[1:]
+    
+    def ciphertext_spectra(self, ciphertext: FHECiphertext) -> Tuple[np.ndarray, np.ndarray]:
+        """Limb spectra of a ciphertext, cached on the ciphertext itself"""
+        if ciphertext.ntt_cache is None:
+            q = self.params.ciphertext_modulus
+            # Both rows are transformed in one call over the (2, n) layout
+            ciphertext.ntt_cache = limb_spectrum(to_limbs(ciphertext.data, q))
+        return ciphertext.ntt_cache[0], ciphertext.ntt_cache[1]
     
     def generate_keypair(self) -> Tuple[FHEPublicKey, FHESecretKey, EvaluationKey]:
         """Generate FHE key pair"""
@@ -141,90 +296,168 @@ class SimplifiedBFV:
     
     def encrypt(self, plaintext: int) -> FHECiphertext:
         """Encrypt plaintext"""
+        return self.batch_encrypt_vec([plaintext])[0]
+    
+    def batch_encrypt_vec(self, plaintexts: Union[Sequence[int], np.ndarray]) -> List[FHECiphertext]:
+        """Encrypt a vector of plaintexts with batched sampling and transforms"""
         if not self.public_key:
             raise ValueError("Public key not available")
         
-        # Encode plaintext as polynomial
-        m = np.zeros(self.params.dimension, dtype=np.int64)
-        m[0] = plaintext % self.params.plaintext_modulus
-        
-        # Sample randomness
-        u = self.generate_polynomial(3)  # Small polynomial
-        e0 = self.generate_error()
-        e1 = self.generate_error()
-        
-        # Encryption: ct = (c0, c1)
-        # c0 = pk0*u + e0 + m
-        # c1 = pk1*u + e1
-        c0 = self.polynomial_multiply(
-            self.public_key.pk0, u, self.params.ciphertext_modulus
+        q = self.params.ciphertext_modulus
+        t = self.params.plaintext_modulus
+        n = self.params.dimension
+        sd = self.params.standard_deviation
+        (pk_spec,) = self._cached_spectra(
+            self.public_key, np.stack([self.public_key.pk0, self.public_key.pk1])
         )
-        c0 = (c0 + e0 + m * (self.params.ciphertext_modulus // self.params.plaintext_modulus)) % self.params.ciphertext_modulus
-        
-        c1 = self.polynomial_multiply(
-            self.public_key.pk1, u, self.params.ciphertext_modulus
-        )
-        c1 = (c1 + e1) % self.params.ciphertext_modulus
+        if not (isinstance(plaintexts, np.ndarray) and plaintexts.dtype == np.int64):
+            # Reduce as Python ints so values beyond 64 bits are accepted
+            plaintexts = np.array([int(p) % t for p in plaintexts], dtype=np.int64)
+        
+        ciphertexts = []
+        for start in range(0, len(plaintexts), ENCRYPT_CHUNK_SIZE):
+            chunk = plaintexts[start:start + ENCRYPT_CHUNK_SIZE]
+            batch = len(chunk)
+            
+            # Encode plaintexts as polynomials
+            m = np.zeros((batch, n), dtype=np.int64)
+            m[:, 0] = chunk % t
+            
+            # Sample randomness
+            u = sample_centered(3, (batch, n))  # Small polynomials
+            e0 = np.random.normal(0, sd, (batch, n)).astype(int)
+            e1 = np.random.normal(0, sd, (batch, n)).astype(int)
+            
+            # Encryption: ct = (c0, c1)
+            # c0 = pk0*u + e0 + m
+            # c1 = pk1*u + e1
+            # computed together as a (batch, 2, n) block
+            u_spec = limb_spectrum(u[:, np.newaxis, np.newaxis, :])
+            data = spectral_multiply(pk_spec, u_spec, n, q)
+            data[:, 0] += e0 + m * (q // t)
+            data[:, 1] += e1
+            data %= q
+            
+            # Copy rows out so each ciphertext owns its (2, n) buffer
+            ciphertexts.extend(
+                FHECiphertext(data=data[i].copy(), level=0, scale=1.0)
+                for i in range(batch)
+            )
         
-        return FHECiphertext(c0=c0, c1=c1, level=0, scale=1.0)
+        return ciphertexts
     
-    def decrypt(self, ciphertext: FHECiphertext) -> int:
-        """Decrypt ciphertext"""
+    def decrypt(self, ciphertext: FHECiphertext, c1_spec: Optional[np.ndarray] = None) -> int:
+        """Decrypt ciphertext
+        
+        c1_spec may supply the limb spectrum of c1 when the caller already
+        has it; otherwise the ciphertext's cached spectra are used.
+        """
         if not self.secret_key:
             raise ValueError("Secret key not available")
         
+        q = self.params.ciphertext_modulus
+        t = self.params.plaintext_modulus
+        n = ciphertext.data.shape[1]
+        (sk_spec,) = self._cached_spectra(self.secret_key, self.secret_key.sk)
+        if c1_spec is None:
+            _, c1_spec = self.ciphertext_spectra(ciphertext)
+        
         # Decryption: m = [c0 + c1*sk]_q mod t
-        result = ciphertext.c0 + self.polynomial_multiply(
-            ciphertext.c1, self.secret_key.sk, 
-            self.params.ciphertext_modulus
-        )
-        result = result % self.params.ciphertext_modulus
+        result = ciphertext.c0 + spectral_multiply(c1_spec, sk_spec, n, q)
+        result = result % q
         
         # Scale down and round
-        scale = self.params.ciphertext_modulus // self.params.plaintext_modulus
-        plaintext = np.round(result[0] / scale).astype(int) % self.params.plaintext_modulus
+        scale = q // t
+        plaintext = np.round(result[0] / scale).astype(int) % t
         
         return int(plaintext)
     
-    def add(self, ct1: FHECiphertext, ct2: FHECiphertext) -> FHECiphertext:
-        """Homomorphic addition"""
-        c0 = (ct1.c0 + ct2.c0) % self.params.ciphertext_modulus
-        c1 = (ct1.c1 + ct2.c1) % self.params.ciphertext_modulus
+    def add(self, ct1: FHECiphertext, ct2: FHECiphertext, out: Optional[np.ndarray] = None) -> FHECiphertext:
+        """Homomorphic addition
+        
+        out may name a (2, n) buffer to write the sum into, such as the data
+        of an intermediate result the caller is about to discard. Any
+        ciphertext sharing that buffer must not be used afterwards.
+        """
+        q = self.params.ciphertext_modulus
+        data = np.add(ct1.data, ct2.data, out=out)
+        np.remainder(data, q, out=data)
         
         return FHECiphertext(
-            c0=c0, c1=c1, 
+            data=data,
             level=max(ct1.level, ct2.level),
             scale=ct1.scale
         )
     
     def multiply(self, ct1: FHECiphertext, ct2: FHECiphertext) -> FHECiphertext:
         """Homomorphic multiplication (requires relinearization)"""
+        q = self.params.ciphertext_modulus
+        n = ct1.data.shape[1]
+        
+        # Operand spectra are cached on the ciphertexts, so chained operations
+        # skip the forward transforms of inputs they have already seen
+        a0, a1 = self.ciphertext_spectra(ct1)
+        b0, b1 = self.ciphertext_spectra(ct2)
+        
         # Multiplication produces 3 components
-        c0 = self.polynomial_multiply(
-            ct1.c0, ct2.c0, self.params.ciphertext_modulus
+        data = np.empty((2, n), dtype=np.int64)
+        data[0] = spectral_multiply(a0, b0, n, q)
+        data[1] = spectral_multiply(a0, b1, n, q) + spectral_multiply(a1, b0, n, q)
+        
+        c2 = spectral_multiply(a1, b1, n, q)
+        
+        self._relinearize(data, c2)
+        
+        return FHECiphertext(
+            data=data,
+            level=max(ct1.level, ct2.level) + 1,
+            scale=ct1.scale * ct2.scale
         )
+    
+    def inner_product(self, cts1: List[FHECiphertext], cts2: List[FHECiphertext]) -> FHECiphertext:
+        """Sum of homomorphic products, relinearized once at the end"""
+        if len(cts1) != len(cts2) or not cts1:
+            raise ValueError("Ciphertext lists must be non-empty and of equal length")
+        
+        q = self.params.ciphertext_modulus
+        n = cts1[0].data.shape[1]
+        
+        def tensor_spectra():
+            for ct1, ct2 in zip(cts1, cts2):
+                self.ciphertext_spectra(ct1)
+                self.ciphertext_spectra(ct2)
+                # (2, 1) x (1, 2) broadcast gives all four row products
+                yield ct1.ntt_cache[:, np.newaxis], ct2.ntt_cache[np.newaxis]
         
-        c1 = self.polynomial_multiply(ct1.c0, ct2.c1, self.params.ciphertext_modulus)
-        c1 += self.polynomial_multiply(ct1.c1, ct2.c0, self.params.ciphertext_modulus)
-        c1 = c1 % self.params.ciphertext_modulus
+        tensor = spectral_inner_product(tensor_spectra(), n, q)
         
-        c2 = self.polynomial_multiply(
-            ct1.c1, ct2.c1, self.params.ciphertext_modulus
+        data = np.empty((2, n), dtype=np.int64)
+        data[0] = tensor[0, 0]
+        data[1] = tensor[0, 1] + tensor[1, 0]
+        
+        # Relinearization is linear in c2, so the summed term needs it once
+        self._relinearize(data, tensor[1, 1])
+        
+        return FHECiphertext(
+            data=data,
+            level=max(max(ct.level for ct in cts1), max(ct.level for ct in cts2)) + 1,
+            scale=cts1[0].scale * cts2[0].scale
         )
+    
+    def _relinearize(self, data: np.ndarray, c2: np.ndarray):
+        """Fold the c2 component into (c0, c1) in place and reduce modulo q"""
+        q = self.params.ciphertext_modulus
+        n = data.shape[1]
         
         # Relinearization to reduce back to 2 components
         if self.eval_key:
-            # Use evaluation key to reduce c2 term
+            # Use evaluation key to reduce c2 term against both key rows at once
             rlk0, rlk1 = self.eval_key.rlk[0]
-            
-            c0 = (c0 + self.polynomial_multiply(c2, rlk0, self.params.ciphertext_modulus)) % self.params.ciphertext_modulus
-            c1 = (c1 + self.polynomial_multiply(c2, rlk1, self.params.ciphertext_modulus)) % self.params.ciphertext_modulus
+            (rlk_spec,) = self._cached_spectra(self.eval_key, np.stack([rlk0, rlk1]))
+            c2_spec = limb_spectrum(to_limbs(c2, q))
+            data += spectral_multiply(c2_spec, rlk_spec, n, q)
         
-        return FHECiphertext(
-            c0=c0, c1=c1,
-            level=max(ct1.level, ct2.level) + 1,
-            scale=ct1.scale * ct2.scale
-        )
+        np.remainder(data, q, out=data)
     
     def bootstrap(self, ciphertext: FHECiphertext) -> FHECiphertext:
         """Bootstrapping to refresh ciphertext (simplified)"""
@@ -233,13 +466,19 @@ class SimplifiedBFV:
         
         # Decrypt and re-encrypt (cheating for demonstration)
         if self.secret_key:
-            plaintext = self.decrypt(ciphertext)
+            # Start from the cached transform when the ciphertext has one;
+            # otherwise transform c1 alone, since the refreshed ciphertext
+            # replaces this one and c0's spectrum would never be used
+            if ciphertext.ntt_cache is not None:
+                c1_spec = ciphertext.ntt_cache[1]
+            else:
+                c1_spec = limb_spectrum(to_limbs(ciphertext.c1, self.params.ciphertext_modulus))
+            plaintext = self.decrypt(ciphertext, c1_spec=c1_spec)
             return self.encrypt(plaintext)
         
         # Without secret key, just reset level
         return FHECiphertext(
-            c0=ciphertext.c0,
-            c1=ciphertext.c1,
+            data=ciphertext.data,
             level=0,
             scale=1.0
         )
@@ -250,35 +489,49 @@ class BatchedOperations:
     
     def __init__(self, fhe_scheme):
         self.fhe = fhe_scheme
+        # Limb convolutions in polynomial_multiply run in numpy with the GIL
+        # released, so independent multiplies scale across threads
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count())
     
     def batch_encrypt(self, plaintexts: List[int]) -> List[FHECiphertext]:
         """Batch encryption using SIMD slots"""
         # In real FHE, this would use Chinese Remainder Theorem
         # to pack multiple plaintexts into one ciphertext
-        return [self.fhe.encrypt(p) for p in plaintexts]
+        return self.fhe.batch_encrypt_vec(plaintexts)
     
     def batch_add(self, cts1: List[FHECiphertext], cts2: List[FHECiphertext]) -> List[FHECiphertext]:
         """Batch homomorphic addition"""
         if len(cts1) != len(cts2):
             raise ValueError("Ciphertext lists must have same length")
         
-        return [self.fhe.add(ct1, ct2) for ct1, ct2 in zip(cts1, cts2)]
+        add = self.fhe.add
+        return [add(ct1, ct2) for ct1, ct2 in zip(cts1, cts2)]
     
     def batch_multiply(self, cts1: List[FHECiphertext], cts2: List[FHECiphertext]) -> List[FHECiphertext]:
         """Batch homomorphic multiplication"""
         if len(cts1) != len(cts2):
             raise ValueError("Ciphertext lists must have same length")
         
-        return [self.fhe.multiply(ct1, ct2) for ct1, ct2 in zip(cts1, cts2)]
+        return list(self._pool.map(self.fhe.multiply, cts1, cts2))
+    
+    def shutdown(self):
+        """Release worker threads"""
+        self._pool.shutdown(wait=True)
     
     def sum_ciphertexts(self, ciphertexts: List[FHECiphertext]) -> FHECiphertext:
         """Sum multiple ciphertexts"""
         if not ciphertexts:
             return self.fhe.encrypt(0)
         
-        result = ciphertexts[0]
-        for ct in ciphertexts[1:]:
-            result = self.fhe.add(result, ct)
+        if len(ciphertexts) == 1:
+            return ciphertexts[0]
+        
+        # Accumulate in the buffer of the first partial sum rather than
+        # allocating a new one per addition
+        add = self.fhe.add
+        result = add(ciphertexts[0], ciphertexts[1])
+        for ct in ciphertexts[2:]:
+            result = add(result, ct, out=result.data)
         
         return result
 
@@ -295,7 +548,8 @@ class ComparisonCircuit:
         # This is a placeholder implementation
         
         # Compute difference
-        diff = self.fhe.add(ct1, self.negate(ct2))
+        negated = self.negate(ct2)
+        diff = self.fhe.add(ct1, negated, out=negated.data)
         
         # In real FHE, we'd evaluate a comparison circuit here
         # For now, just return the difference
@@ -303,9 +557,10 @@ class ComparisonCircuit:
     
     def negate(self, ciphertext: FHECiphertext) -> FHECiphertext:
         """Negate a ciphertext"""
+        data = np.negative(ciphertext.data)
+        np.remainder(data, self.fhe.params.ciphertext_modulus, out=data)
         return FHECiphertext(
-            c0=-ciphertext.c0 % self.fhe.params.ciphertext_modulus,
-            c1=-ciphertext.c1 % self.fhe.params.ciphertext_modulus,
+            data=data,
             level=ciphertext.level,
             scale=ciphertext.scale
         )
@@ -328,20 +583,23 @@ class PrivateInformationRetrieval:
     
     def setup_database(self, data: List[int]):
         """Setup encrypted database"""
-        self.database = [self.fhe.encrypt(value) for value in data]
+        self.database = self.fhe.batch_encrypt_vec(data)
+        
+        # Precompute the transform-domain form of every record once, so
+        # queries only transform their own selection vector
+        for ct in self.database:
+            self.fhe.ciphertext_spectra(ct)
     
     def private_query(self, index: int) -> FHECiphertext:
         """Query database privately"""
-        if index >= len(self.database):
+        if not 0 <= index < len(self.database):
             raise ValueError("Index out of range")
         
         # Create selection vector (one-hot encoded)
-        selection = [self.fhe.encrypt(1 if i == index else 0) for i in range(len(self.database))]
-        
-        # Multiply and sum
-        result = self.fhe.encrypt(0)
-        for sel, val in zip(selection, self.database):
-            product = self.fhe.multiply(sel, val)
-            result = self.fhe.add(result, product)
+        one_hot = np.zeros(len(self.database), dtype=np.int64)
+        one_hot[index] = 1
+        selection = self.fhe.batch_encrypt_vec(one_hot)
         
-        return result
\ No newline at end of file
+        # Multiply and sum, accumulating the products in the transform domain
+        product = self.fhe.inner_product(selection, self.database)
+        return self.fhe.add(self.fhe.encrypt(0), product, out=product.data)
\ No newline at end of file
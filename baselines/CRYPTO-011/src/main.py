@@ -1,12 +1,16 @@
 """Main API for Homomorphic Encryption System"""
 import asyncio
+import itertools
+import os
 import time
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 import structlog
@@ -14,12 +18,13 @@ import numpy as np
 
 from paillier_he import (
     PaillierCryptosystem, PartiallyHomomorphicOperations,
-    NoiseManager, CKKSApproximateScheme
+    NoiseManager, CKKSApproximateScheme, shutdown_batch_executor
 )
 from fhe_operations import (
     SimplifiedBFV, FHEParameters, BatchedOperations,
     ComparisonCircuit, PrivateInformationRetrieval
 )
+from ciphertext_store import CiphertextStore
 
 # Configure structured logging
 structlog.configure(
@@ -46,10 +51,35 @@ batch_ops: Optional[BatchedOperations] = None
 noise_manager: Optional[NoiseManager] = None
 ckks_scheme: Optional[CKKSApproximateScheme] = None
 pir_system: Optional[PrivateInformationRetrieval] = None
+crypto_executor: Optional[ThreadPoolExecutor] = None
+
+# Memory budget for stored ciphertexts; least recently used entries are evicted
+MAX_STORED_CIPHERTEXT_BYTES = 1024 * 1024 * 1024
 
 # Storage for keys and ciphertexts
 stored_keys: Dict[str, Any] = {}
-stored_ciphertexts: Dict[str, Any] = {}
+stored_ciphertexts: CiphertextStore = CiphertextStore(max_bytes=MAX_STORED_CIPHERTEXT_BYTES)
+
+# Monotonic sequence numbers for generated ids (unique even within one ms)
+_key_seq = itertools.count()
+_ct_seq = itertools.count()
+_result_seq = itertools.count()
+_batch_seq = itertools.count()
+_bootstrap_seq = itertools.count()
+_pir_db_seq = itertools.count()
+_pir_result_seq = itertools.count()
+
+# Key id indexes over stored_keys (the first key registered for a slot wins)
+keys_by_user_scheme: Dict[Tuple[str, str], str] = {}
+keys_by_user: Dict[str, str] = {}
+keys_by_scheme: Dict[str, str] = {}
+
+
+def index_key(user_id: str, scheme: str, key_id: str):
+    """Register a stored key in the lookup indexes"""
+    keys_by_user_scheme.setdefault((user_id, scheme), key_id)
+    keys_by_user.setdefault(user_id, key_id)
+    keys_by_scheme.setdefault(scheme, key_id)
 
 
 # Pydantic models
@@ -67,8 +97,19 @@ class KeyGenerationResponse(BaseModel):
     created_at: float
 
 
+class CryptoJSONResponse(ORJSONResponse):
+    """orjson response that falls back to json for integers beyond 64 bits"""
+    
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            # Paillier plaintexts live in Z_n and may not fit in 64 bits
+            return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
 class EncryptRequest(BaseModel):
-    plaintext: Any  # int, float, or list
+    plaintext: Union[int, float, List[int], List[float]]
     user_id: str
     scheme: str = Field(default="paillier")
 
@@ -108,11 +149,14 @@ class BatchOperationRequest(BaseModel):
     operation: str = Field(..., pattern="^(encrypt|add|multiply|sum)$")
     plaintexts: Optional[List[int]] = None
     ciphertext_ids: Optional[List[str]] = None
+    other_ciphertext_ids: Optional[List[str]] = None  # second operands for "add"
     user_id: str
 
 
 class BatchOperationResponse(BaseModel):
-    result_ids: List[str]
+    # Result ids are f"{prefix}{start_id + i}" for i in range(count)
+    prefix: str
+    start_id: int
     operation: str
     count: int
 
@@ -143,11 +187,13 @@ class PIRQueryResponse(BaseModel):
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     global paillier_system, phe_ops, fhe_system, batch_ops, noise_manager, ckks_scheme, pir_system
+    global crypto_executor
     
     # Startup
     logger.info("Starting Homomorphic Encryption System")
     
     # Initialize systems
+    crypto_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
     paillier_system = PaillierCryptosystem()
     phe_ops = PartiallyHomomorphicOperations(paillier_system)
     
@@ -169,6 +215,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Homomorphic Encryption System")
+    batch_ops.shutdown()
+    crypto_executor.shutdown(wait=True)
+    shutdown_batch_executor()
 
 
 # Create FastAPI app
@@ -176,6 +225,7 @@ app = FastAPI(
     title="Homomorphic Encryption System",
     description="Privacy-preserving computation with homomorphic encryption",
     version="1.0.0",
+    default_response_class=CryptoJSONResponse,
     lifespan=lifespan
 )
 
@@ -189,6 +239,12 @@ app.add_middleware(
 )
 
 
+async def run_blocking(func, *args):
+    """Run CPU-bound crypto work on the executor, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(crypto_executor, func, *args)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -206,6 +262,11 @@ async def health_check():
 @app.post("/api/v1/keys/generate", response_model=KeyGenerationResponse)
 async def generate_keys(request: KeyGenerationRequest):
     """Generate homomorphic encryption keys"""
+    return await run_blocking(_generate_keys, request)
+
+
+def _generate_keys(request: KeyGenerationRequest) -> KeyGenerationResponse:
+    """Generate homomorphic encryption keys (runs on the crypto executor)"""
     try:
         start_time = time.time()
         
@@ -214,7 +275,7 @@ async def generate_keys(request: KeyGenerationRequest):
             public_key, private_key = system.generate_keypair()
             
             # Store keys
-            key_id = f"{request.user_id}_{request.scheme}_{int(time.time())}"
+            key_id = f"{request.user_id}_{request.scheme}_{next(_key_seq)}"
             stored_keys[key_id] = {
                 "public_key": public_key,
                 "private_key": private_key,
@@ -227,7 +288,7 @@ async def generate_keys(request: KeyGenerationRequest):
             system = SimplifiedBFV(params)
             public_key, private_key, eval_key = system.generate_keypair()
             
-            key_id = f"{request.user_id}_{request.scheme}_{int(time.time())}"
+            key_id = f"{request.user_id}_{request.scheme}_{next(_key_seq)}"
             stored_keys[key_id] = {
                 "public_key": public_key,
                 "private_key": private_key,
@@ -240,12 +301,14 @@ async def generate_keys(request: KeyGenerationRequest):
             system = CKKSApproximateScheme()
             system.paillier.generate_keypair()
             
-            key_id = f"{request.user_id}_{request.scheme}_{int(time.time())}"
+            key_id = f"{request.user_id}_{request.scheme}_{next(_key_seq)}"
             stored_keys[key_id] = {
                 "scheme": request.scheme,
                 "system": system
             }
         
+        index_key(request.user_id, request.scheme, key_id)
+        
         generation_time = time.time() - start_time
         logger.info(f"Keys generated", scheme=request.scheme, time=generation_time)
         
@@ -265,25 +328,27 @@ async def generate_keys(request: KeyGenerationRequest):
 @app.post("/api/v1/encrypt", response_model=EncryptResponse)
 async def encrypt(request: EncryptRequest):
     """Encrypt plaintext"""
+    return await run_blocking(_encrypt, request)
+
+
+def _encrypt(request: EncryptRequest) -> EncryptResponse:
+    """Encrypt plaintext (runs on the crypto executor)"""
     try:
         # Find user's keys
-        key_id = None
-        for kid, key_data in stored_keys.items():
-            if request.user_id in kid and request.scheme in kid:
-                key_id = kid
-                break
+        key_id = keys_by_user_scheme.get((request.user_id, request.scheme))
         
         if not key_id:
             raise HTTPException(status_code=404, detail="Keys not found for user")
         
         key_data = stored_keys[key_id]
-        ciphertext_id = f"ct_{request.user_id}_{int(time.time()*1000)}"
+        ciphertext_id = f"ct_{request.user_id}_{next(_ct_seq)}"
         
         if request.scheme == "paillier":
             system = key_data["system"]
             
             if isinstance(request.plaintext, list):
-                ciphertexts = system.batch_encrypt(request.plaintext)
+                # Same integer conversion as the scalar path
+                ciphertexts = system.batch_encrypt([int(p) for p in request.plaintext])
                 stored_ciphertexts[ciphertext_id] = {
                     "ciphertexts": ciphertexts,
                     "scheme": request.scheme,
@@ -301,7 +366,7 @@ async def encrypt(request: EncryptRequest):
             system = key_data["system"]
             
             if isinstance(request.plaintext, list):
-                ciphertexts = [system.encrypt(int(p)) for p in request.plaintext]
+                ciphertexts = system.batch_encrypt_vec(request.plaintext)
                 stored_ciphertexts[ciphertext_id] = {
                     "ciphertexts": ciphertexts,
                     "scheme": request.scheme,
@@ -319,7 +384,7 @@ async def encrypt(request: EncryptRequest):
             system = key_data["system"]
             
             if isinstance(request.plaintext, list):
-                ciphertexts = [system.encrypt_float(float(p)) for p in request.plaintext]
+                ciphertexts = system.encrypt_vec(request.plaintext)
                 stored_ciphertexts[ciphertext_id] = {
                     "ciphertexts": ciphertexts,
                     "scheme": request.scheme,
@@ -342,6 +407,8 @@ async def encrypt(request: EncryptRequest):
             size_bytes=size_bytes
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Encryption error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -350,52 +417,65 @@ async def encrypt(request: EncryptRequest):
 @app.post("/api/v1/compute", response_model=HomomorphicOperationResponse)
 async def homomorphic_compute(request: HomomorphicOperationRequest):
     """Perform homomorphic operation"""
+    return await run_blocking(_homomorphic_compute, request)
+
+
+def _homomorphic_compute(request: HomomorphicOperationRequest) -> HomomorphicOperationResponse:
+    """Perform homomorphic operation (runs on the crypto executor)"""
     try:
         # Get operands
-        if request.operand1_id not in stored_ciphertexts:
+        ct1_data = stored_ciphertexts.get(request.operand1_id)
+        if ct1_data is None:
             raise HTTPException(status_code=404, detail="Operand 1 not found")
         
-        ct1_data = stored_ciphertexts[request.operand1_id]
         scheme = ct1_data["scheme"]
         
         # Find appropriate system
-        system = None
-        for key_data in stored_keys.values():
-            if key_data["scheme"] == scheme:
-                system = key_data["system"]
-                break
+        key_id = keys_by_scheme.get(scheme)
+        system = stored_keys[key_id]["system"] if key_id else None
         
         if not system:
             raise HTTPException(status_code=404, detail="System not found")
         
-        result_id = f"result_{int(time.time()*1000)}"
+        result_id = f"result_{next(_result_seq)}"
         
         # Perform operation
         if request.operation == "add":
-            if request.operand2_id not in stored_ciphertexts:
+            ct2_data = stored_ciphertexts.get(request.operand2_id)
+            if ct2_data is None:
                 raise HTTPException(status_code=404, detail="Operand 2 not found")
             
-            ct2_data = stored_ciphertexts[request.operand2_id]
-            
-            if scheme == "paillier":
-                result = system.add(ct1_data["ciphertext"], ct2_data["ciphertext"])
-            elif scheme == "bfv":
-                result = system.add(ct1_data["ciphertext"], ct2_data["ciphertext"])
-            else:  # ckks
-                result = system.add_floats(ct1_data["ciphertext"], ct2_data["ciphertext"])
-            
-            stored_ciphertexts[result_id] = {
-                "ciphertext": result,
-                "scheme": scheme,
-                "batch": False
-            }
+            if scheme == "ckks" and ct1_data.get("batch"):
+                if not ct2_data.get("batch"):
+                    raise HTTPException(status_code=400, detail="Operands must both be vectors")
+                
+                stored_ciphertexts[result_id] = {
+                    "ciphertexts": system.add_floats_vec(ct1_data["ciphertexts"], ct2_data["ciphertexts"]),
+                    "scheme": scheme,
+                    "batch": True
+                }
+            else:
+                if scheme == "paillier":
+                    result = system.add(ct1_data["ciphertext"], ct2_data["ciphertext"])
+                elif scheme == "bfv":
+                    result = system.add(ct1_data["ciphertext"], ct2_data["ciphertext"])
+                else:  # ckks
+                    result = system.add_floats(ct1_data["ciphertext"], ct2_data["ciphertext"])
+                
+                stored_ciphertexts[result_id] = {
+                    "ciphertext": result,
+                    "scheme": scheme,
+                    "batch": False
+                }
             
         elif request.operation == "multiply":
             if scheme == "paillier":
                 raise HTTPException(status_code=400, detail="Paillier doesn't support multiplication")
             
             if request.operand2_id:
-                ct2_data = stored_ciphertexts[request.operand2_id]
+                ct2_data = stored_ciphertexts.get(request.operand2_id)
+                if ct2_data is None:
+                    raise HTTPException(status_code=404, detail="Operand 2 not found")
                 result = system.multiply(ct1_data["ciphertext"], ct2_data["ciphertext"])
             else:
                 raise HTTPException(status_code=400, detail="Second operand required")
@@ -410,10 +490,47 @@ async def homomorphic_compute(request: HomomorphicOperationRequest):
             if not request.scalar:
                 raise HTTPException(status_code=400, detail="Scalar value required")
             
-            if scheme == "paillier":
-                result = system.multiply_by_scalar(ct1_data["ciphertext"], int(request.scalar))
-            elif scheme == "ckks":
-                result = system.multiply_by_float(ct1_data["ciphertext"], request.scalar)
+            if scheme == "ckks" and ct1_data.get("batch"):
+                stored_ciphertexts[result_id] = {
+                    "ciphertexts": system.multiply_vec_by_float(ct1_data["ciphertexts"], request.scalar),
+                    "scheme": scheme,
+                    "batch": True
+                }
+            else:
+                if scheme == "paillier":
+                    result = system.multiply_by_scalar(ct1_data["ciphertext"], int(request.scalar))
+                elif scheme == "ckks":
+                    result = system.multiply_by_float(ct1_data["ciphertext"], request.scalar)
+                else:
+                    raise HTTPException(status_code=400, detail="Operation not supported for scheme")
+                
+                stored_ciphertexts[result_id] = {
+                    "ciphertext": result,
+                    "scheme": scheme,
+                    "batch": False
+                }
+        
+        elif request.operation == "dot_product":
+            if not ct1_data.get("batch"):
+                raise HTTPException(status_code=400, detail="Operand 1 must be a ciphertext vector")
+            
+            if scheme == "bfv":
+                # Encrypted . encrypted, accumulated in the transform domain
+                ct2_data = stored_ciphertexts.get(request.operand2_id)
+                if ct2_data is None:
+                    raise HTTPException(status_code=404, detail="Operand 2 not found")
+                if ct2_data["scheme"] != scheme or not ct2_data.get("batch"):
+                    raise HTTPException(status_code=400, detail="Operand 2 must be a BFV ciphertext vector")
+                
+                result = system.inner_product(ct1_data["ciphertexts"], ct2_data["ciphertexts"])
+            elif scheme == "paillier":
+                # Encrypted . plaintext vector
+                if not request.vector:
+                    raise HTTPException(status_code=400, detail="Plaintext vector required")
+                
+                result = PartiallyHomomorphicOperations(system).encrypted_dot_product(
+                    ct1_data["ciphertexts"], [int(v) for v in request.vector]
+                )
             else:
                 raise HTTPException(status_code=400, detail="Operation not supported for scheme")
             
@@ -434,6 +551,8 @@ async def homomorphic_compute(request: HomomorphicOperationRequest):
             needs_bootstrapping=needs_bootstrap
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Computation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -442,19 +561,20 @@ async def homomorphic_compute(request: HomomorphicOperationRequest):
 @app.post("/api/v1/decrypt", response_model=DecryptResponse)
 async def decrypt(request: DecryptRequest):
     """Decrypt ciphertext"""
+    return await run_blocking(_decrypt, request)
+
+
+def _decrypt(request: DecryptRequest) -> DecryptResponse:
+    """Decrypt ciphertext (runs on the crypto executor)"""
     try:
-        if request.ciphertext_id not in stored_ciphertexts:
+        ct_data = stored_ciphertexts.get(request.ciphertext_id)
+        if ct_data is None:
             raise HTTPException(status_code=404, detail="Ciphertext not found")
-        
-        ct_data = stored_ciphertexts[request.ciphertext_id]
         scheme = ct_data["scheme"]
         
         # Find user's keys
-        key_data = None
-        for kid, kdata in stored_keys.items():
-            if request.user_id in kid and scheme in kid:
-                key_data = kdata
-                break
+        key_id = keys_by_user_scheme.get((request.user_id, scheme))
+        key_data = stored_keys[key_id] if key_id else None
         
         if not key_data:
             raise HTTPException(status_code=404, detail="Keys not found")
@@ -468,7 +588,7 @@ async def decrypt(request: DecryptRequest):
             elif scheme == "bfv":
                 plaintexts = [system.decrypt(ct) for ct in ct_data["ciphertexts"]]
             else:  # ckks
-                plaintexts = [system.decrypt_float(ct) for ct in ct_data["ciphertexts"]]
+                plaintexts = system.decrypt_vec(ct_data["ciphertexts"])
             
             return DecryptResponse(plaintext=plaintexts, scheme=scheme)
         else:
@@ -482,6 +602,8 @@ async def decrypt(request: DecryptRequest):
             
             return DecryptResponse(plaintext=plaintext, scheme=scheme)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Decryption error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -490,13 +612,15 @@ async def decrypt(request: DecryptRequest):
 @app.post("/api/v1/batch", response_model=BatchOperationResponse)
 async def batch_operation(request: BatchOperationRequest):
     """Perform batch operations"""
+    return await run_blocking(_batch_operation, request)
+
+
+def _batch_operation(request: BatchOperationRequest) -> BatchOperationResponse:
+    """Perform batch operations (runs on the crypto executor)"""
     try:
         # Find user's keys
-        key_data = None
-        for kid, kdata in stored_keys.items():
-            if request.user_id in kid:
-                key_data = kdata
-                break
+        key_id = keys_by_user.get(request.user_id)
+        key_data = stored_keys[key_id] if key_id else None
         
         if not key_data:
             raise HTTPException(status_code=404, detail="Keys not found")
@@ -510,28 +634,55 @@ async def batch_operation(request: BatchOperationRequest):
             
             if scheme == "bfv":
                 ciphertexts = batch_ops.batch_encrypt(request.plaintexts)
+            elif scheme == "paillier":
+                ciphertexts = system.batch_encrypt(request.plaintexts)
             else:
                 ciphertexts = [system.encrypt(p) for p in request.plaintexts]
+        
+        elif request.operation == "add":
+            if not request.ciphertext_ids or not request.other_ciphertext_ids:
+                raise HTTPException(status_code=400, detail="Two ciphertext id lists required")
             
-            result_ids = []
-            for i, ct in enumerate(ciphertexts):
-                ct_id = f"batch_{request.user_id}_{int(time.time()*1000)}_{i}"
-                stored_ciphertexts[ct_id] = {
-                    "ciphertext": ct,
-                    "scheme": scheme,
-                    "batch": False
-                }
-                result_ids.append(ct_id)
+            if len(request.ciphertext_ids) != len(request.other_ciphertext_ids):
+                raise HTTPException(status_code=400, detail="Ciphertext id lists must have same length")
+            
+            operands = []
+            for ct_ids in (request.ciphertext_ids, request.other_ciphertext_ids):
+                cts = []
+                for ct_id in ct_ids:
+                    ct_data = stored_ciphertexts.get(ct_id)
+                    if not ct_data or ct_data["scheme"] != scheme or ct_data.get("batch"):
+                        raise HTTPException(status_code=404, detail=f"Ciphertext {ct_id} not found")
+                    cts.append(ct_data["ciphertext"])
+                operands.append(cts)
             
-            return BatchOperationResponse(
-                result_ids=result_ids,
-                operation=request.operation,
-                count=len(result_ids)
-            )
+            if scheme == "bfv":
+                ciphertexts = [system.add(ct1, ct2) for ct1, ct2 in zip(*operands)]
+            else:
+                paillier = system if scheme == "paillier" else system.paillier
+                ciphertexts = PartiallyHomomorphicOperations(paillier).batch_add(*operands)
         
         else:
             raise HTTPException(status_code=400, detail="Operation not supported")
         
+        # One sequence number per batch keeps its result ids contiguous
+        prefix = f"batch_{request.user_id}_{next(_batch_seq)}_"
+        for i, ct in enumerate(ciphertexts):
+            stored_ciphertexts[f"{prefix}{i}"] = {
+                "ciphertext": ct,
+                "scheme": scheme,
+                "batch": False
+            }
+        
+        return BatchOperationResponse(
+            prefix=prefix,
+            start_id=0,
+            operation=request.operation,
+            count=len(ciphertexts)
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Batch operation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -540,12 +691,16 @@ async def batch_operation(request: BatchOperationRequest):
 @app.post("/api/v1/bootstrap", response_model=BootstrapResponse)
 async def bootstrap(request: BootstrapRequest):
     """Bootstrap ciphertext to refresh noise"""
+    return await run_blocking(_bootstrap, request)
+
+
+def _bootstrap(request: BootstrapRequest) -> BootstrapResponse:
+    """Bootstrap ciphertext to refresh noise (runs on the crypto executor)"""
     try:
-        if request.ciphertext_id not in stored_ciphertexts:
+        ct_data = stored_ciphertexts.get(request.ciphertext_id)
+        if ct_data is None:
             raise HTTPException(status_code=404, detail="Ciphertext not found")
         
-        ct_data = stored_ciphertexts[request.ciphertext_id]
-        
         if ct_data["scheme"] != "bfv":
             raise HTTPException(status_code=400, detail="Bootstrapping only for FHE schemes")
         
@@ -557,7 +712,7 @@ async def bootstrap(request: BootstrapRequest):
         new_ct = fhe_system.bootstrap(old_ct)
         
         # Store new ciphertext
-        new_id = f"bootstrapped_{int(time.time()*1000)}"
+        new_id = f"bootstrapped_{next(_bootstrap_seq)}"
         stored_ciphertexts[new_id] = {
             "ciphertext": new_ct,
             "scheme": "bfv",
@@ -575,6 +730,8 @@ async def bootstrap(request: BootstrapRequest):
             noise_after=noise_after
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Bootstrap error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -583,10 +740,15 @@ async def bootstrap(request: BootstrapRequest):
 @app.post("/api/v1/pir/setup")
 async def setup_pir_database(data: List[int]):
     """Setup PIR database"""
+    return await run_blocking(_setup_pir_database, data)
+
+
+def _setup_pir_database(data: List[int]) -> Dict[str, Any]:
+    """Setup PIR database (runs on the crypto executor)"""
     try:
         pir_system.setup_database(data)
         
-        db_id = f"pir_db_{int(time.time())}"
+        db_id = f"pir_db_{next(_pir_db_seq)}"
         stored_ciphertexts[db_id] = {
             "database": pir_system.database,
             "size": len(data),
@@ -603,12 +765,16 @@ async def setup_pir_database(data: List[int]):
 @app.post("/api/v1/pir/query", response_model=PIRQueryResponse)
 async def pir_query(request: PIRQueryRequest):
     """Query PIR database"""
+    return await run_blocking(_pir_query, request)
+
+
+def _pir_query(request: PIRQueryRequest) -> PIRQueryResponse:
+    """Query PIR database (runs on the crypto executor)"""
     try:
-        if request.database_id not in stored_ciphertexts:
+        db_data = stored_ciphertexts.get(request.database_id)
+        if db_data is None:
             raise HTTPException(status_code=404, detail="Database not found")
         
-        db_data = stored_ciphertexts[request.database_id]
-        
         if db_data.get("type") != "pir":
             raise HTTPException(status_code=400, detail="Not a PIR database")
         
@@ -616,7 +782,7 @@ async def pir_query(request: PIRQueryRequest):
         result = pir_system.private_query(request.index)
         
         # Store result
-        result_id = f"pir_result_{int(time.time()*1000)}"
+        result_id = f"pir_result_{next(_pir_result_seq)}"
         stored_ciphertexts[result_id] = {
             "ciphertext": result,
             "scheme": "bfv",
@@ -628,6 +794,8 @@ async def pir_query(request: PIRQueryRequest):
             encrypted=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"PIR query error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
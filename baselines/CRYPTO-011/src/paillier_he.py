@@ -1,38 +1,180 @@
 """Paillier Homomorphic Encryption Implementation"""
+import numbers
 import secrets
-import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Tuple, Optional, List, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import gmpy2
+from gmpy2 import mpz, powmod, powmod_sec, invert, divexact
+import numpy as np
 import json
 
 
+# Batches at least this large are spread across worker processes
+PARALLEL_BATCH_THRESHOLD = 64
+
+# Product of all primes below 2000, for sieving prime candidates with one gcd
+SMALL_PRIMES_PRODUCT = gmpy2.primorial(2000)
+
+# Precomputed randomizers r^n mod n^2 kept ready per cryptosystem
+RANDOMIZER_POOL_SIZE = 256
+
+# Fixed-base randomizers (h^n)^s: exponent length (twice the 128-bit
+# security level, against short-exponent attacks) and comb window width
+RANDOMIZER_EXPONENT_BITS = 256
+RANDOMIZER_WINDOW = 5
+
+_batch_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_batch_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared process pool for batch modexp (None on single-core hosts)"""
+    global _batch_executor
+    if (os.cpu_count() or 1) < 2:
+        return None
+    if _batch_executor is None:
+        _batch_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _batch_executor
+
+
+def shutdown_batch_executor():
+    """Shut down the shared batch process pool"""
+    global _batch_executor
+    if _batch_executor is not None:
+        _batch_executor.shutdown(wait=True)
+        _batch_executor = None
+
+
+def _split_chunks(items: List[Any], num_chunks: int) -> List[List[Any]]:
+    """Split items into at most num_chunks contiguous chunks"""
+    size = -(-len(items) // num_chunks)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _generate_prime(key_size: int, bits: int) -> int:
+    """Worker: search for one prime"""
+    return PaillierCryptosystem(key_size).generate_prime(bits)
+
+
+def _encrypt_chunk(key: Any, plaintexts: List[int]) -> List[int]:
+    """Worker: encrypt a chunk of plaintexts with a public or private key"""
+    return [key.encrypt(p) for p in plaintexts]
+
+
+def _decrypt_chunk(private_key: "PaillierPrivateKey", ciphertexts: List[int]) -> List[int]:
+    """Worker: decrypt a chunk of ciphertexts"""
+    return [private_key.decrypt(c) for c in ciphertexts]
+
+
+def _dot_product_chunk(n_sq: int, ciphertexts: List[int], scalars: List[int]) -> int:
+    """Worker: prod c_i^k_i mod n^2 over a chunk"""
+    result = mpz(1)
+    for c, k in zip(ciphertexts, scalars):
+        result = result * powmod(c, k, n_sq) % n_sq
+    return result
+
+
 @dataclass
 class PaillierPublicKey:
     """Paillier public key"""
     n: int  # n = p * q
     g: int  # generator
     n_sq: int  # n^2
-    
-    def encrypt(self, plaintext: int, r: Optional[int] = None) -> int:
-        """Encrypt plaintext using public key"""
+    # g^(2^i) mod n^2, built on first use for generators other than n + 1
+    _g_table: Optional[List[int]] = field(default=None, init=False, repr=False, compare=False)
+    # (h^n)^(j * 2^(window * i)) mod n^2 for a fixed random unit h
+    _rn_table: Optional[List[List[int]]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Keys built from plain ints (e.g. deserialized) still get GMP arithmetic
+        self.n, self.g, self.n_sq = mpz(self.n), mpz(self.g), mpz(self.n_sq)
+    
+    def encrypt(self, plaintext: int, r: Optional[int] = None, rn: Optional[int] = None) -> int:
+        """Encrypt plaintext using public key
+        
+        rn may supply a precomputed randomizer r^n mod n^2 in place of r.
+        """
+        # GMP arithmetic would carry a float through as an mpfr "ciphertext"
+        if not isinstance(plaintext, numbers.Integral):
+            raise TypeError(f"Plaintext must be an integer, not {type(plaintext).__name__}")
         if plaintext < 0 or plaintext >= self.n:
             raise ValueError(f"Plaintext must be in range [0, {self.n})")
         
-        if r is None:
-            # Generate random r where gcd(r, n) = 1
-            while True:
-                r = secrets.randbelow(self.n)
-                if math.gcd(r, self.n) == 1:
-                    break
+        if rn is None:
+            rn = self.randomizer() if r is None else powmod(r, self.n, self.n_sq)
         
         # Ciphertext: c = g^m * r^n mod n^2
-        gm = pow(self.g, plaintext, self.n_sq)
-        rn = pow(r, self.n, self.n_sq)
+        gm = self.g_pow(plaintext)
         ciphertext = (gm * rn) % self.n_sq
         
         return ciphertext
     
+    def g_pow(self, m: int) -> int:
+        """Compute g^m mod n^2 without a general modexp"""
+        if self.g == self.n + 1:
+            # Binomial expansion: (n + 1)^m = 1 + m*n mod n^2
+            return (1 + m * self.n) % self.n_sq
+        
+        if self._g_table is None:
+            table = [self.g % self.n_sq]
+            for _ in range(self.n.bit_length() - 1):
+                table.append(table[-1] * table[-1] % self.n_sq)
+            self._g_table = table
+        
+        # Multiply the precomputed powers selected by the set bits of m
+        result = 1
+        for i in range(m.bit_length()):
+            if (m >> i) & 1:
+                result = result * self._g_table[i] % self.n_sq
+        return result
+    
+    def precompute_randomizer_table(self, window: int = RANDOMIZER_WINDOW):
+        """Build the fixed-base table used by randomizer()"""
+        n_sq = self.n_sq
+        base = powmod(self.random_unit(), self.n, n_sq)  # h^n
+        table = []
+        for _ in range(-(-RANDOMIZER_EXPONENT_BITS // window)):
+            row = [mpz(1), base]
+            for _ in range(2, 1 << window):
+                row.append(row[-1] * base % n_sq)
+            table.append(row)
+            base = row[-1] * base % n_sq  # advance to base^(2^window)
+        self._rn_table = table
+    
+    def randomizer(self) -> int:
+        """Compute a fresh randomizer r^n mod n^2
+        
+        With the fixed-base table built, r = h^s for a random
+        RANDOMIZER_EXPONENT_BITS-bit s, and (h^n)^s takes one table
+        multiply per window instead of a full-width modexp.
+        """
+        table = self._rn_table
+        if table is None:
+            return powmod(self.random_unit(), self.n, self.n_sq)
+        
+        n_sq = self.n_sq
+        window = len(table[0]).bit_length() - 1
+        mask = (1 << window) - 1
+        s = secrets.randbits(RANDOMIZER_EXPONENT_BITS)
+        result = mpz(1)
+        for row in table:
+            digit = s & mask
+            if digit:
+                result = result * row[digit] % n_sq
+            s >>= window
+        return result
+    
+    def random_unit(self) -> int:
+        """Generate random r where gcd(r, n) = 1"""
+        while True:
+            r = mpz(secrets.randbelow(int(self.n)))
+            if gmpy2.gcd(r, self.n) == 1:
+                return r
+    
     def add_encrypted(self, c1: int, c2: int) -> int:
         """Add two encrypted values (homomorphic addition)"""
         # E(m1 + m2) = E(m1) * E(m2) mod n^2
@@ -41,7 +183,7 @@ class PaillierPublicKey:
     def multiply_encrypted(self, ciphertext: int, scalar: int) -> int:
         """Multiply encrypted value by scalar (homomorphic scalar multiplication)"""
         # E(m * k) = E(m)^k mod n^2
-        return pow(ciphertext, scalar, self.n_sq)
+        return powmod(ciphertext, scalar, self.n_sq)
 
 
 @dataclass
@@ -50,21 +192,83 @@ class PaillierPrivateKey:
     lambda_n: int  # lcm(p-1, q-1)
     mu: int  # modular multiplicative inverse
     public_key: PaillierPublicKey
+    p: Optional[int] = None  # prime factors of n, when known
+    q: Optional[int] = None
+    # CRT constants for computing r^n mod n^2 (derived from p and q)
+    _crt: Optional[Tuple[int, int, int, int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # CRT constants for decryption: (p^2, q^2, hp, hq, q^-1 mod p)
+    _crt_decrypt: Optional[Tuple[int, int, int, int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        self.lambda_n, self.mu = mpz(self.lambda_n), mpz(self.mu)
+        if self.p is not None and self.q is not None:
+            self.p, self.q = mpz(self.p), mpz(self.q)
+            p, q = self.p, self.q
+            n, g = self.public_key.n, self.public_key.g
+            p_sq, q_sq = p * p, q * q
+            self._crt = (
+                p_sq, q_sq,
+                n % (p_sq - p),  # n reduced mod phi(p^2)
+                n % (q_sq - q),  # n reduced mod phi(q^2)
+                invert(q_sq, p_sq),
+            )
+            
+            # hp = L_p(g^(p-1) mod p^2)^-1 mod p, hq likewise
+            hp = invert(divexact(powmod_sec(g, p - 1, p_sq) - 1, p), p)
+            hq = invert(divexact(powmod_sec(g, q - 1, q_sq) - 1, q), q)
+            self._crt_decrypt = (p_sq, q_sq, hp, hq, invert(q, p))
+    
+    def randomizer(self, r: Optional[int] = None) -> int:
+        """Compute r^n mod n^2 via CRT over p^2 and q^2 (key owner only)"""
+        if r is None:
+            if self.public_key._rn_table is not None:
+                # The fixed-base table beats even the CRT modexps
+                return self.public_key.randomizer()
+            r = self.public_key.random_unit()
+        if self._crt is None:
+            return powmod(r, self.public_key.n, self.public_key.n_sq)
+        
+        p_sq, q_sq, exp_p, exp_q, q_sq_inv = self._crt
+        xp = powmod(r, exp_p, p_sq)
+        xq = powmod(r, exp_q, q_sq)
+        return xq + q_sq * (((xp - xq) * q_sq_inv) % p_sq)
+    
+    def encrypt(self, plaintext: int) -> int:
+        """Encrypt plaintext using the factorization of n for the randomizer"""
+        return self.public_key.encrypt(plaintext, rn=self.randomizer())
     
     def decrypt(self, ciphertext: int) -> int:
         """Decrypt ciphertext using private key"""
         if ciphertext < 0 or ciphertext >= self.public_key.n_sq:
             raise ValueError("Invalid ciphertext")
         
+        if self._crt_decrypt is not None:
+            return self._decrypt_crt(ciphertext)
+        
         # L function: L(x) = (x - 1) / n
         def L(x: int) -> int:
-            return (x - 1) // self.public_key.n
+            return divexact(x - 1, self.public_key.n)
         
         # Plaintext: m = L(c^lambda mod n^2) * mu mod n
-        x = pow(ciphertext, self.lambda_n, self.public_key.n_sq)
+        x = powmod_sec(ciphertext, self.lambda_n, self.public_key.n_sq)
         plaintext = (L(x) * self.mu) % self.public_key.n
         
-        return plaintext
+        return int(plaintext)
+    
+    def _decrypt_crt(self, ciphertext: int) -> int:
+        """Decrypt with two half-size modexps mod p^2 and q^2 combined via CRT"""
+        p, q = self.p, self.q
+        p_sq, q_sq, hp, hq, q_inv = self._crt_decrypt
+        
+        # Exponents p - 1 and q - 1 are secret: use GMP's constant-time modexp
+        mp = divexact(powmod_sec(ciphertext, p - 1, p_sq) - 1, p) * hp % p
+        mq = divexact(powmod_sec(ciphertext, q - 1, q_sq) - 1, q) * hq % q
+        
+        return int(mq + q * (((mp - mq) * q_inv) % p))
 
 
 class PaillierCryptosystem:
@@ -74,59 +278,54 @@ class PaillierCryptosystem:
         self.key_size = key_size
         self.public_key: Optional[PaillierPublicKey] = None
         self.private_key: Optional[PaillierPrivateKey] = None
+        # r^n values for the current key, refilled by a background thread
+        self._rand_pool: deque = deque()
+        self._refill_lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
     
     def generate_prime(self, bits: int) -> int:
         """Generate a prime number with specified bit length"""
+        limit = 1 << bits
         while True:
-            # Generate random odd number
-            p = secrets.randbits(bits) | 1
-            
-            # Miller-Rabin primality test (simplified)
-            if self.is_probable_prime(p):
-                return p
-    
-    def is_probable_prime(self, n: int, k: int = 10) -> bool:
-        """Miller-Rabin primality test"""
-        if n < 2:
-            return False
-        if n == 2 or n == 3:
-            return True
-        if n % 2 == 0:
-            return False
-        
-        # Write n-1 as 2^r * d
-        r, d = 0, n - 1
-        while d % 2 == 0:
-            r += 1
-            d //= 2
-        
-        # Witness loop
-        for _ in range(k):
-            a = secrets.randbelow(n - 3) + 2
-            x = pow(a, d, n)
+            # Random odd start with the top two bits set, so p * q has
+            # exactly twice as many bits
+            p = mpz(secrets.randbits(bits) | (3 << (bits - 2)) | 1)
             
-            if x == 1 or x == n - 1:
-                continue
-            
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
+            # Walk odd candidates upward; a gcd against the small-prime
+            # product discards most composites before any modexp
+            while p < limit:
+                if gmpy2.gcd(p, SMALL_PRIMES_PRODUCT) == 1 and self.is_probable_prime(p):
+                    return p
+                p += 2
+    
+    def is_probable_prime(self, n: int, k: int = 25) -> bool:
+        """Probabilistic primality test
         
-        return True
+        Runs GMP's mpz_probab_prime_p: trial division, a Baillie-PSW test
+        and k - 24 further Miller-Rabin rounds, all in C.
+        """
+        return gmpy2.is_prime(mpz(n), k)
     
     def generate_keypair(self) -> Tuple[PaillierPublicKey, PaillierPrivateKey]:
         """Generate Paillier key pair"""
-        # Generate two large primes p and q
-        p = self.generate_prime(self.key_size // 2)
-        q = self.generate_prime(self.key_size // 2)
+        # Generate two large primes p and q, searching for both at once
+        # in worker processes when the key is large enough to pay off
+        bits = self.key_size // 2
+        executor = get_batch_executor() if self.key_size >= 1024 else None
+        if executor is not None:
+            p_future = executor.submit(_generate_prime, self.key_size, bits)
+            q_future = executor.submit(_generate_prime, self.key_size, bits)
+            p, q = p_future.result(), q_future.result()
+        else:
+            p = self.generate_prime(bits)
+            q = self.generate_prime(bits)
         
         # Ensure p != q
         while p == q:
             q = self.generate_prime(self.key_size // 2)
         
+        # Key material is held as gmpy2 mpz so all modular arithmetic runs in GMP
+        p, q = mpz(p), mpz(q)
         n = p * q
         n_sq = n * n
         
@@ -134,25 +333,30 @@ class PaillierCryptosystem:
         g = n + 1
         
         # lambda = lcm(p-1, q-1)
-        lambda_n = math.lcm(p - 1, q - 1)
+        lambda_n = gmpy2.lcm(p - 1, q - 1)
         
         # mu = (L(g^lambda mod n^2))^-1 mod n
         def L(x: int) -> int:
-            return (x - 1) // n
+            return divexact(x - 1, n)
         
-        x = pow(g, lambda_n, n_sq)
-        mu = pow(L(x), -1, n)  # Modular inverse
+        x = powmod_sec(g, lambda_n, n_sq)
+        mu = invert(L(x), n)  # Modular inverse
         
         # Create keys
         public_key = PaillierPublicKey(n=n, g=g, n_sq=n_sq)
+        public_key.precompute_randomizer_table()
         private_key = PaillierPrivateKey(
             lambda_n=lambda_n,
             mu=mu,
-            public_key=public_key
+            public_key=public_key,
+            p=p,
+            q=q
         )
         
         self.public_key = public_key
         self.private_key = private_key
+        # Randomizers are tied to n; drop any left over from a previous key
+        self._rand_pool = deque()
         
         return public_key, private_key
     
@@ -160,7 +364,43 @@ class PaillierCryptosystem:
         """Encrypt plaintext"""
         if not self.public_key:
             raise ValueError("Keys not generated")
-        return self.public_key.encrypt(plaintext)
+        return self.public_key.encrypt(plaintext, rn=self.next_randomizer())
+    
+    def next_randomizer(self) -> int:
+        """Take a precomputed r^n mod n^2, computing one inline if none is ready"""
+        pool = self._rand_pool
+        try:
+            rn = pool.popleft()
+        except IndexError:
+            rn = self._compute_randomizer()
+        
+        if len(pool) < RANDOMIZER_POOL_SIZE // 2:
+            self._start_refill()
+        return rn
+    
+    def _compute_randomizer(self) -> int:
+        """Compute a fresh r^n mod n^2"""
+        # The key owner uses the CRT constants precomputed from p and q
+        if self.private_key:
+            return self.private_key.randomizer()
+        return self.public_key.randomizer()
+    
+    def _start_refill(self):
+        """Start the background refill unless one is already running"""
+        with self._refill_lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(
+                target=self._refill_randomizers, args=(self._rand_pool,), daemon=True
+            )
+            self._refill_thread.start()
+    
+    def _refill_randomizers(self, pool: deque):
+        """Fill the pool up to RANDOMIZER_POOL_SIZE; stops if the key changes"""
+        while len(pool) < RANDOMIZER_POOL_SIZE and pool is self._rand_pool:
+            rn = self._compute_randomizer()
+            if pool is self._rand_pool:
+                pool.append(rn)
     
     def decrypt(self, ciphertext: int) -> int:
         """Decrypt ciphertext"""
@@ -182,20 +422,51 @@ class PaillierCryptosystem:
     
     def batch_encrypt(self, plaintexts: List[int]) -> List[int]:
         """Batch encryption for efficiency"""
-        return [self.encrypt(p) for p in plaintexts]
+        if not self.public_key:
+            raise ValueError("Keys not generated")
+        
+        # The key owner computes the randomizer r^n via CRT, with half-size
+        # moduli and reduced exponents, instead of one full modexp mod n^2
+        key = self.private_key or self.public_key
+        
+        executor = get_batch_executor() if len(plaintexts) >= PARALLEL_BATCH_THRESHOLD else None
+        if executor is None:
+            # Small batches draw on the precomputed randomizer pool
+            public_key = self.public_key
+            return [public_key.encrypt(p, rn=self.next_randomizer()) for p in plaintexts]
+        
+        # Each worker runs an independent stream of modexps over its chunk
+        chunks = _split_chunks(list(plaintexts), os.cpu_count())
+        results = executor.map(_encrypt_chunk, repeat(key), chunks)
+        return [c for chunk in results for c in chunk]
     
     def batch_decrypt(self, ciphertexts: List[int]) -> List[int]:
         """Batch decryption"""
-        return [self.decrypt(c) for c in ciphertexts]
+        if not self.private_key:
+            raise ValueError("Private key not available")
+        
+        executor = get_batch_executor() if len(ciphertexts) >= PARALLEL_BATCH_THRESHOLD else None
+        if executor is None:
+            return [self.decrypt(c) for c in ciphertexts]
+        
+        chunks = _split_chunks(list(ciphertexts), os.cpu_count())
+        results = executor.map(_decrypt_chunk, repeat(self.private_key), chunks)
+        return [m for chunk in results for m in chunk]
     
     def sum_encrypted(self, ciphertexts: List[int]) -> int:
         """Sum multiple encrypted values"""
         if not ciphertexts:
             return self.encrypt(0)
         
-        result = ciphertexts[0]
+        if not self.public_key:
+            raise ValueError("Public key not available")
+        
+        # Reduce after every product: deferring the reduction grows the
+        # operands, and GMP's division cost rises faster than it saves
+        n_sq = self.public_key.n_sq
+        result = mpz(ciphertexts[0])
         for c in ciphertexts[1:]:
-            result = self.add(result, c)
+            result = result * c % n_sq
         
         return result
     
@@ -228,15 +499,37 @@ class PartiallyHomomorphicOperations:
             raise ValueError("Vectors must have same length")
         
         result = self.crypto.encrypt(0)
-        
-        for enc_val, plain_val in zip(encrypted_vector, plain_vector):
-            # Multiply encrypted value by plaintext scalar
-            product = self.crypto.multiply_by_scalar(enc_val, plain_val)
-            # Add to result
-            result = self.crypto.add(result, product)
+        n_sq = self.crypto.public_key.n_sq
+        
+        # Fused multiply-accumulate: E(sum m_i * k_i) = prod E(m_i)^k_i mod n^2
+        executor = get_batch_executor() if len(encrypted_vector) >= PARALLEL_BATCH_THRESHOLD else None
+        if executor is None:
+            return result * _dot_product_chunk(n_sq, encrypted_vector, plain_vector) % n_sq
+        
+        # The modexps are independent; each worker returns one partial product
+        num_chunks = os.cpu_count()
+        partials = executor.map(
+            _dot_product_chunk,
+            repeat(n_sq),
+            _split_chunks(list(encrypted_vector), num_chunks),
+            _split_chunks(list(plain_vector), num_chunks)
+        )
+        for partial in partials:
+            result = result * partial % n_sq
         
         return result
     
+    def batch_add(self, list_a: List[int], list_b: List[int]) -> List[int]:
+        """Element-wise homomorphic addition of two ciphertext vectors"""
+        if len(list_a) != len(list_b):
+            raise ValueError("Vectors must have same length")
+        if not self.crypto.public_key:
+            raise ValueError("Public key not available")
+        
+        # E(a_i + b_i) = E(a_i) * E(b_i) mod n^2, in one pass over mpz operands
+        n_sq = self.crypto.public_key.n_sq
+        return [mpz(a) * b % n_sq for a, b in zip(list_a, list_b)]
+    
     def encrypted_linear_combination(
         self,
         encrypted_values: List[int],
@@ -248,15 +541,28 @@ class PartiallyHomomorphicOperations:
     def encrypted_polynomial(
         self,
         encrypted_x: int,
-        coefficients: List[int]
+        coefficients: List[int],
+        deterministic_constant: bool = False
     ) -> int:
-        """Evaluate polynomial on encrypted value (limited degree)"""
+        """Evaluate polynomial on encrypted value (limited degree)
+        
+        With deterministic_constant, a0 is folded in as g^a0 without fresh
+        randomness. That skips an encryption, but the constant term is then
+        not semantically secure: anyone can tell which a0 was added. When
+        a1 != 0, the result still carries x's randomness.
+        """
         # Note: Only works for degree 1 polynomials in Paillier
         # p(x) = a0 + a1*x
         if len(coefficients) > 2:
             raise ValueError("Paillier only supports degree 1 polynomials")
         
-        result = self.crypto.encrypt(coefficients[0]) if coefficients else self.crypto.encrypt(0)
+        a0 = coefficients[0] if coefficients else 0
+        if deterministic_constant:
+            if not self.crypto.public_key:
+                raise ValueError("Public key not available")
+            result = self.crypto.public_key.g_pow(a0)
+        else:
+            result = self.crypto.encrypt(a0)
         
         if len(coefficients) > 1:
             term = self.crypto.multiply_by_scalar(encrypted_x, coefficients[1])
@@ -316,16 +622,36 @@ class CKKSApproximateScheme:
         """Decode integer to floating point"""
         return value / self.scale
     
+    def encode_batch(self, values: List[float]) -> List[int]:
+        """Encode a vector of floating point values in one NumPy pass"""
+        scaled = np.asarray(values, dtype=np.float64) * self.scale
+        if np.all(np.abs(scaled) < 2.0 ** 63):
+            # astype truncates toward zero like int() in encode()
+            return scaled.astype(np.int64).tolist()
+        return [int(v) for v in scaled]
+    
+    def decode_batch(self, values: List[int]) -> List[float]:
+        """Decode a vector of integers to floating point in one NumPy pass"""
+        return (np.asarray(values, dtype=np.float64) / self.scale).tolist()
+    
     def encrypt_float(self, value: float) -> int:
         """Encrypt floating point value"""
         encoded = self.encode(value)
         return self.paillier.encrypt(encoded)
     
+    def encrypt_vec(self, values: List[float]) -> List[int]:
+        """Encrypt a vector of floating point values in one batch"""
+        return self.paillier.batch_encrypt(self.encode_batch(values))
+    
     def decrypt_float(self, ciphertext: int) -> float:
         """Decrypt to floating point value"""
         decrypted = self.paillier.decrypt(ciphertext)
         return self.decode(decrypted)
     
+    def decrypt_vec(self, ciphertexts: List[int]) -> List[float]:
+        """Decrypt a vector of floating point values in one batch"""
+        return self.decode_batch(self.paillier.batch_decrypt(ciphertexts))
+    
     def add_floats(self, c1: int, c2: int) -> int:
         """Add encrypted floating point values"""
         return self.paillier.add(c1, c2)
@@ -340,4 +666,18 @@ class CKKSApproximateScheme:
         
         # Adjust for double scaling
         # In practice, this needs more careful handling
-        return result
\ No newline at end of file
+        return result
+    
+    def add_floats_vec(self, cts1: List[int], cts2: List[int]) -> List[int]:
+        """Add two encrypted floating point vectors element-wise"""
+        return PartiallyHomomorphicOperations(self.paillier).batch_add(cts1, cts2)
+    
+    def multiply_vec_by_float(self, ciphertexts: List[int], scalar: float) -> List[int]:
+        """Multiply an encrypted floating point vector by one scalar"""
+        if not self.paillier.public_key:
+            raise ValueError("Public key not available")
+        
+        # Encode the scalar once and run the modexps back to back in GMP
+        scalar_int = int(scalar * self.scale)
+        n_sq = self.paillier.public_key.n_sq
+        return [powmod(ct, scalar_int, n_sq) for ct in ciphertexts]
\ No newline at end of file
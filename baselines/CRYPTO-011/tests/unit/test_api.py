@@ -0,0 +1,144 @@
+"""Unit tests for the homomorphic encryption API."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# The service imports its modules from src/ as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def paillier_user(client):
+    response = client.post("/api/v1/keys/generate", json={
+        "scheme": "paillier",
+        "key_size": 1024,
+        "user_id": "alice"
+    })
+    assert response.status_code == 200
+    return "alice"
+
+
+@pytest.fixture(scope="module")
+def bfv_user(client):
+    response = client.post("/api/v1/keys/generate", json={
+        "scheme": "bfv",
+        "user_id": "bob"
+    })
+    assert response.status_code == 200
+    return "bob"
+
+
+class TestEncrypt:
+    """Test the encrypt endpoint."""
+
+    def test_bfv_wide_plaintext(self, client, bfv_user):
+        """Test BFV plaintexts beyond 64 bits are reduced mod t."""
+        response = client.post("/api/v1/encrypt", json={
+            "plaintext": 2 ** 70 + 5,
+            "user_id": bfv_user,
+            "scheme": "bfv"
+        })
+        assert response.status_code == 200
+
+        response = client.post("/api/v1/decrypt", json={
+            "ciphertext_id": response.json()["ciphertext_id"],
+            "user_id": bfv_user
+        })
+        assert response.status_code == 200
+        assert response.json()["plaintext"] == (2 ** 70 + 5) % 1024
+
+    def test_bfv_wide_plaintext_list(self, client, bfv_user):
+        """Test BFV plaintext lists beyond 64 bits are reduced mod t."""
+        plaintexts = [2 ** 70 + 5, -2 ** 64 - 3, 7]
+        response = client.post("/api/v1/encrypt", json={
+            "plaintext": plaintexts,
+            "user_id": bfv_user,
+            "scheme": "bfv"
+        })
+        assert response.status_code == 200
+
+        response = client.post("/api/v1/decrypt", json={
+            "ciphertext_id": response.json()["ciphertext_id"],
+            "user_id": bfv_user
+        })
+        assert response.status_code == 200
+        assert response.json()["plaintext"] == [p % 1024 for p in plaintexts]
+
+
+class TestBatchOperation:
+    """Test the batch operation endpoint."""
+
+    def test_batch_add(self, client, paillier_user):
+        """Test adding two batches of ciphertexts."""
+        ids = []
+        for plaintexts in ([1, 2, 3], [10, 20, 30]):
+            response = client.post("/api/v1/batch", json={
+                "operation": "encrypt",
+                "plaintexts": plaintexts,
+                "user_id": paillier_user
+            })
+            assert response.status_code == 200
+            batch = response.json()
+            ids.append([f"{batch['prefix']}{batch['start_id'] + i}" for i in range(batch["count"])])
+
+        response = client.post("/api/v1/batch", json={
+            "operation": "add",
+            "ciphertext_ids": ids[0],
+            "other_ciphertext_ids": ids[1],
+            "user_id": paillier_user
+        })
+        assert response.status_code == 200
+        batch = response.json()
+
+        sums = []
+        for i in range(batch["count"]):
+            response = client.post("/api/v1/decrypt", json={
+                "ciphertext_id": f"{batch['prefix']}{batch['start_id'] + i}",
+                "user_id": paillier_user
+            })
+            assert response.status_code == 200
+            sums.append(response.json()["plaintext"])
+        assert sums == [11, 22, 33]
+
+    def test_batch_add_missing_ids(self, client, paillier_user):
+        """Test that batch add requires both id lists."""
+        response = client.post("/api/v1/batch", json={
+            "operation": "add",
+            "ciphertext_ids": ["a"],
+            "user_id": paillier_user
+        })
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Two ciphertext id lists required"
+
+    def test_batch_add_length_mismatch(self, client, paillier_user):
+        """Test that batch add rejects id lists of different lengths."""
+        response = client.post("/api/v1/batch", json={
+            "operation": "add",
+            "ciphertext_ids": ["a", "b"],
+            "other_ciphertext_ids": ["c"],
+            "user_id": paillier_user
+        })
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Ciphertext id lists must have same length"
+
+    def test_batch_add_unknown_ciphertext(self, client, paillier_user):
+        """Test that batch add reports unknown ciphertexts as not found."""
+        response = client.post("/api/v1/batch", json={
+            "operation": "add",
+            "ciphertext_ids": ["nope"],
+            "other_ciphertext_ids": ["nope"],
+            "user_id": paillier_user
+        })
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Ciphertext nope not found"
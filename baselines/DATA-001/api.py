@@ -5,26 +5,47 @@ Provides REST API for log submission and queries.
 """
 
 from fastapi import FastAPI, HTTPException, Query, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
+from collections import Counter, defaultdict
+from functools import partial
+from itertools import islice
 from datetime import datetime, timedelta
+import asyncio
 import json
 import time
-import re
-from app import LogPipeline, LogEntry
+from app import LogPipeline, LogEntry, normalize_level, intern_source, install_uvloop
+
+class LogJSONResponse(ORJSONResponse):
+    """orjson response that falls back to json for values orjson rejects."""
+    
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            # Log fields may carry integers beyond 64 bits
+            return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Log Aggregation API",
     description="Real-time log aggregation and query API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=LogJSONResponse
 )
 
 # Initialize pipeline
 pipeline = LogPipeline()
 
 
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking storage scan on the pipeline executor, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pipeline.executor, partial(func, *args, **kwargs))
+
+
 class LogSubmission(BaseModel):
     """Log submission model."""
     timestamp: Optional[float] = Field(None, description="Unix timestamp")
@@ -67,17 +88,18 @@ async def submit_log(log: LogSubmission):
     """Submit a log entry via HTTP."""
     try:
         # Create log entry
+        now = time.time()
         entry = LogEntry(
-            timestamp=log.timestamp or time.time(),
-            source=log.source,
-            level=log.level.upper(),
+            timestamp=log.timestamp or now,
+            source=intern_source(log.source),
+            level=normalize_level(log.level),
             message=log.message,
-            fields=log.fields,
-            raw=json.dumps(log.dict())
+            # fields may be sent as null
+            fields=log.fields or {}
         )
         
-        # Process through pipeline
-        pipeline.process_log(entry.raw, entry.source)
+        # Already structured: skip serializing and re-parsing it
+        pipeline.process_entry(entry, now)
         
         return {"status": "accepted", "timestamp": str(entry.timestamp)}
     
@@ -89,24 +111,29 @@ async def submit_log(log: LogSubmission):
 async def submit_logs_batch(logs: List[LogSubmission]):
     """Submit multiple log entries."""
     try:
-        accepted = 0
         errors = []
+        entries = []
+        # One clock read for the whole batch
+        now = time.time()
         
         for log in logs:
             try:
                 entry = LogEntry(
-                    timestamp=log.timestamp or time.time(),
-                    source=log.source,
-                    level=log.level.upper(),
+                    timestamp=log.timestamp or now,
+                    source=intern_source(log.source),
+                    level=normalize_level(log.level),
                     message=log.message,
-                    fields=log.fields,
-                    raw=json.dumps(log.dict())
+                    fields=log.fields or {}
                 )
-                pipeline.process_log(entry.raw, entry.source)
-                accepted += 1
+                entries.append(entry)
             except Exception as e:
                 errors.append(str(e))
         
+        # One pipeline call for the whole batch (single storage write)
+        failed = pipeline.process_entries(entries, now=now)
+        errors.extend(f"Failed to process log {i}" for i in failed)
+        accepted = len(entries) - len(failed)
+        
         return {
             "status": "processed",
             "accepted": accepted,
@@ -134,7 +161,8 @@ async def query_logs(
         end_ts = parse_time(end_time) if end_time else None
         
         # Query storage
-        results = pipeline.storage.query(
+        results = await run_blocking(
+            pipeline.storage.query,
             start_time=start_ts,
             end_time=end_ts,
             level=level.upper() if level else None,
@@ -158,14 +186,15 @@ async def aggregate_logs(query: AggregationQuery):
         start_time = end_time - parse_duration(query.time_range)
         
         # Query logs
-        logs = pipeline.storage.query(
+        logs = await run_blocking(
+            pipeline.storage.query,
             start_time=start_time,
             end_time=end_time,
             limit=100000  # Large limit for aggregation
         )
         
         # Perform aggregation
-        result = perform_aggregation(logs, query.group_by, query.operation)
+        result = await run_blocking(perform_aggregation, logs, query.group_by, query.operation)
         
         return {
             "time_range": {
@@ -197,7 +226,9 @@ async def add_alert_rule(rule: AlertRule):
 async def get_recent_alerts(limit: int = Query(100, ge=1, le=1000)):
     """Get recent triggered alerts."""
     try:
-        alerts = list(pipeline.alert_manager.alerts)[-limit:]
+        # Copy only the newest `limit` alerts, then restore oldest-first order
+        alerts = list(islice(reversed(pipeline.alert_manager.alerts), limit))
+        alerts.reverse()
         return alerts
     
     except Exception as e:
@@ -208,14 +239,7 @@ async def get_recent_alerts(limit: int = Query(100, ge=1, le=1000)):
 async def get_statistics():
     """Get pipeline statistics."""
     try:
-        stats = pipeline.get_stats()
-        
-        # Calculate rate
-        if stats['total_logs'] > 0:
-            runtime = time.time() - pipeline.aggregator.windows.get('1min', {}).get('start_time', time.time())
-            stats['logs_per_second'] = stats['total_logs'] / max(runtime, 1)
-        
-        return stats
+        return pipeline.get_stats()
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -227,22 +251,25 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+# Seconds per relative time unit (e.g. "30m", "7d")
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_relative(value_str: str) -> Optional[int]:
+    """Parse a relative time like "1h" to seconds, or None if it is not one."""
+    unit = DURATION_UNITS.get(value_str[-1:])
+    digits = value_str[:-1]
+    if unit is None or not digits.isdecimal():
+        return None
+    return int(digits) * unit
+
+
 def parse_time(time_str: str) -> float:
     """Parse time string to Unix timestamp."""
     # Try relative time (e.g., "1h", "30m", "7d")
-    relative_pattern = re.match(r'^(\d+)([smhd])$', time_str)
-    if relative_pattern:
-        value = int(relative_pattern.group(1))
-        unit = relative_pattern.group(2)
-        
-        if unit == 's':
-            return time.time() - value
-        elif unit == 'm':
-            return time.time() - (value * 60)
-        elif unit == 'h':
-            return time.time() - (value * 3600)
-        elif unit == 'd':
-            return time.time() - (value * 86400)
+    seconds = parse_relative(time_str)
+    if seconds is not None:
+        return time.time() - seconds
     
     # Try ISO format
     try:
@@ -260,59 +287,44 @@ def parse_time(time_str: str) -> float:
 
 def parse_duration(duration_str: str) -> float:
     """Parse duration string to seconds."""
-    pattern = re.match(r'^(\d+)([smhd])$', duration_str)
-    if not pattern:
+    seconds = parse_relative(duration_str)
+    if seconds is None:
         raise ValueError(f"Invalid duration format: {duration_str}")
     
-    value = int(pattern.group(1))
-    unit = pattern.group(2)
-    
-    if unit == 's':
-        return value
-    elif unit == 'm':
-        return value * 60
-    elif unit == 'h':
-        return value * 3600
-    elif unit == 'd':
-        return value * 86400
-    
-    raise ValueError(f"Invalid duration unit: {unit}")
+    return seconds
 
 
 def perform_aggregation(logs: List[Dict], group_by: str, operation: str) -> Dict[str, Any]:
     """Perform aggregation on logs."""
-    groups = {}
-    
-    for log in logs:
+    def group_key(log: Dict) -> Any:
         # Get grouping key
         if group_by == 'level':
-            key = log.get('level', 'UNKNOWN')
+            return log.get('level', 'UNKNOWN')
         elif group_by == 'source':
-            key = log.get('source', 'unknown')
-        elif group_by in log.get('fields', {}):
-            key = log['fields'][group_by]
-        else:
-            key = 'other'
-        
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(log)
+            return log.get('source', 'unknown')
+        fields = log.get('fields', {})
+        if group_by in fields:
+            return fields[group_by]
+        return 'other'
     
-    # Perform operation
-    results = {}
-    for key, group_logs in groups.items():
-        if operation == 'count':
-            results[key] = len(group_logs)
-        elif operation == 'avg_size':
-            sizes = [len(log.get('raw', '')) for log in group_logs]
-            results[key] = sum(sizes) / len(sizes) if sizes else 0
-        elif operation == 'unique_sources':
-            sources = set(log.get('source', 'unknown') for log in group_logs)
-            results[key] = len(sources)
-        else:
-            results[key] = len(group_logs)  # Default to count
+    # Single pass per operation, keeping only per-group state
+    if operation == 'avg_size':
+        sums = defaultdict(int)
+        counts = Counter()
+        for log in logs:
+            key = group_key(log)
+            sums[key] += len(log.get('raw', ''))
+            counts[key] += 1
+        return {key: sums[key] / count for key, count in counts.items()}
+    
+    if operation == 'unique_sources':
+        sources = defaultdict(set)
+        for log in logs:
+            sources[group_key(log)].add(log.get('source', 'unknown'))
+        return {key: len(group_sources) for key, group_sources in sources.items()}
     
-    return results
+    # 'count', and the default for unknown operations
+    return dict(Counter(map(group_key, logs)))
 
 
 if __name__ == "__main__":
@@ -323,21 +335,13 @@ if __name__ == "__main__":
     
     # Global shutdown event
     shutdown_event = threading.Event()
+    install_uvloop()
     
     # Modified pipeline start function with proper shutdown
     def start_pipeline():
-        import asyncio
-        
-        # Start UDP server in a non-daemon thread with shutdown event
-        udp_thread = threading.Thread(
-            target=pipeline.start_udp_server,
-            args=(514, shutdown_event)
-        )
-        udp_thread.start()
-        
-        # Start TCP server with shutdown handling
+        # TCP and UDP receivers share one event loop and stop on shutdown_event
         try:
-            asyncio.run(pipeline.start_tcp_server(5514))
+            asyncio.run(pipeline.serve(5514, 514, shutdown_event))
         except KeyboardInterrupt:
             pass
         finally:
@@ -6,28 +6,138 @@ processing, storage, and query capabilities.
 """
 
 import asyncio
+import heapq
 import json
+import os
+from array import array
 import time
 import re
-import gzip
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional, Tuple
-from collections import deque, defaultdict
-from dataclasses import dataclass, asdict
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from dataclasses import dataclass
 from pathlib import Path
 import socket
 import struct
+import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor
 import logging
 
+import orjson
+import zstandard as zstd
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson reads integers outside the 64-bit range as floats
+WIDE_NUMBER = 2.0 ** 63
+
+# Syslog severities in order, so LEVELS[severity] is the level name
+LEVELS = ('EMERGENCY', 'ALERT', 'CRITICAL', 'ERROR', 'WARNING', 'NOTICE', 'INFO', 'DEBUG')
+
+# Usual spellings of each level mapped to one shared canonical string
+LEVEL_LOOKUP = {
+    spelling: level
+    for level in LEVELS
+    for spelling in (level, level.lower(), level.capitalize())
+}
+
+# Structured fields a raw log line is rebuilt from
+RAW_FIELDS = ('timestamp', 'source', 'level', 'message', 'fields')
+
 
-@dataclass
+def dumps_json(obj: Any) -> str:
+    """Serialize to JSON with orjson, falling back to json for what it rejects."""
+    try:
+        return orjson.dumps(obj).decode()
+    except TypeError:
+        # Integers beyond 64 bits or non-string keys
+        return json.dumps(obj, separators=(',', ':'))
+
+
+def _has_wide_number(obj: Any) -> bool:
+    """Whether a parsed value holds a float orjson may have widened from an int."""
+    # orjson only builds exact dicts, lists and scalars, so type() checks
+    # suffice; scalars are tested inline instead of by a recursive call
+    if type(obj) is dict:
+        values = obj.values()
+    elif type(obj) is list:
+        values = obj
+    elif type(obj) is float:
+        return not -WIDE_NUMBER < obj < WIDE_NUMBER
+    else:
+        return False
+    for value in values:
+        kind = type(value)
+        if kind is float:
+            if not -WIDE_NUMBER < value < WIDE_NUMBER:
+                return True
+        elif kind is dict or kind is list:
+            if _has_wide_number(value):
+                return True
+    return False
+
+
+def loads_json(data: str) -> Any:
+    """Parse JSON with orjson, falling back to json for what it cannot represent."""
+    try:
+        obj = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity; genuinely invalid input raises again here
+        return json.loads(data)
+    if _has_wide_number(obj):
+        # Re-read so integers beyond 64 bits stay exact
+        return json.loads(data)
+    return obj
+
+
+def normalize_level(level: str) -> str:
+    """Upper-case a level name, sharing one string object per distinct level."""
+    return LEVEL_LOOKUP.get(level) or sys.intern(level.upper())
+
+
+def intern_source(source: Any) -> Any:
+    """Share one string object per distinct source name."""
+    return sys.intern(source) if type(source) is str else source
+
+
+def dump_raw(record: Dict[str, Any]) -> str:
+    """Serialize the structured fields of a log record to its raw JSON form."""
+    return dumps_json({key: record[key] for key in RAW_FIELDS})
+
+
+def sqlite_order_key(value: Any) -> Tuple[int, Any]:
+    """Sort key matching SQLite's ordering of mixed column values.
+    
+    NULL sorts before numbers, numbers before text and text before blobs,
+    so rows fetched from separate databases merge in ORDER BY order.
+    """
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, value)
+
+
+@dataclass(slots=True)
 class LogEntry:
     """Represents a single log entry."""
     timestamp: float
@@ -35,63 +145,101 @@ class LogEntry:
     level: str
     message: str
     fields: Dict[str, Any]
-    raw: str
+    raw: Optional[str] = None
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
-        return asdict(self)
+        # Shallow on purpose: asdict() deep-copies fields for every alert
+        return {
+            'timestamp': self.timestamp,
+            'source': self.source,
+            'level': self.level,
+            'message': self.message,
+            'fields': self.fields,
+            'raw': self.raw
+        }
+    
+    def to_raw(self) -> str:
+        """Return the raw log line, rebuilding it if it was never kept."""
+        if self.raw is None:
+            return dump_raw(self.to_dict())
+        return self.raw
 
 
 class LogParser:
     """Parses different log formats."""
     
+    # Syslog pattern (RFC 5424). Possessive quantifiers and bounded
+    # PRI/VERSION keep near-miss lines from backtracking through
+    # every split of each field
+    SYSLOG_PATTERN = re.compile(
+        r'<(\d{1,3})>(\d{1,2}) (\S++) (\S++) (\S++) (\S++) (\S++) - (.+)',
+        re.ASCII
+    )
+    
+    # Apache/Nginx common log format; request fields stop at quotes
+    APACHE_PATTERN = re.compile(
+        r'(\S++) \S++ \S++ \[([\w:/]++\s[+\-]\d{4})\] '
+        r'"([^\s"]++) ([^\s"]++) ([^\s"]++)" (\d{3}) (\d+)',
+        re.ASCII
+    )
+    
+    # key=value pairs in plain text logs; the word boundary stops the
+    # engine retrying the key from every position inside a word
+    KV_PATTERN = re.compile(r'\b(\w+)=(\S+)')
+    
     def __init__(self):
         self.patterns = {
             'json': self._parse_json,
             'syslog': self._parse_syslog,
             'apache': self._parse_apache,
-            'nginx': self._parse_nginx,
+            'nginx': self._parse_apache,
             'plain': self._parse_plain
         }
+    
+    def parse(self, data: str, source: str = 'unknown',
+              now: Optional[float] = None) -> Optional[LogEntry]:
+        """Parse log data and return LogEntry.
         
-        # Syslog pattern (RFC 5424)
-        self.syslog_pattern = re.compile(
-            r'<(\d+)>(\d+) (\S+) (\S+) (\S+) (\S+) (\S+) - (.+)'
-        )
+        now is the receive time given to logs without their own timestamp;
+        batch callers read the clock once and pass it for every line.
+        """
+        if now is None:
+            now = time.time()
         
-        # Apache/Nginx common log format
-        self.apache_pattern = re.compile(
-            r'(\S+) \S+ \S+ \[([\w:/]+\s[+\-]\d{4})\] "(\S+) (\S+) (\S+)" (\d{3}) (\d+)'
-        )
-    
-    def parse(self, data: str, source: str = 'unknown') -> Optional[LogEntry]:
-        """Parse log data and return LogEntry."""
-        # Try JSON first
-        entry = self._parse_json(data, source)
-        if entry:
-            return entry
+        # Cheap substring checks decide which formats can match at all,
+        # so most lines never hit a failing json.loads or regex
+        first = data.lstrip()[:1]
+        
+        # JSON objects start with '{'
+        if first == '{':
+            entry = self._parse_json(data, source, now)
+            if entry:
+                return entry
         
-        # Try syslog
-        entry = self._parse_syslog(data, source)
-        if entry:
-            return entry
+        # Syslog starts with '<PRI>'
+        if data.startswith('<'):
+            entry = self._parse_syslog(data, source, now)
+            if entry:
+                return entry
         
-        # Try Apache/Nginx
-        entry = self._parse_apache(data, source)
-        if entry:
-            return entry
+        # Apache/Nginx always has '] "' between timestamp and request
+        if '] "' in data:
+            entry = self._parse_apache(data, source, now)
+            if entry:
+                return entry
         
         # Fallback to plain text
-        return self._parse_plain(data, source)
+        return self._parse_plain(data, source, now)
     
-    def _parse_json(self, data: str, source: str) -> Optional[LogEntry]:
+    def _parse_json(self, data: str, source: str, now: float) -> Optional[LogEntry]:
         """Parse JSON log format."""
         try:
-            obj = json.loads(data)
+            obj = loads_json(data)
             return LogEntry(
-                timestamp=obj.get('timestamp', time.time()),
-                source=obj.get('source', source),
-                level=obj.get('level', 'info').upper(),
+                timestamp=obj.get('timestamp', now),
+                source=intern_source(obj.get('source', source)),
+                level=normalize_level(obj.get('level', 'INFO')),
                 message=obj.get('message', ''),
                 fields=obj,
                 raw=data
@@ -99,28 +247,24 @@ class LogParser:
         except (json.JSONDecodeError, KeyError):
             return None
     
-    def _parse_syslog(self, data: str, source: str) -> Optional[LogEntry]:
+    def _parse_syslog(self, data: str, source: str, now: float) -> Optional[LogEntry]:
         """Parse syslog format (RFC 5424)."""
-        match = self.syslog_pattern.match(data)
+        match = self.SYSLOG_PATTERN.match(data)
         if match:
             priority = int(match.group(1))
             facility = priority // 8
             severity = priority % 8
-            
-            level_map = {
-                0: 'EMERGENCY', 1: 'ALERT', 2: 'CRITICAL', 3: 'ERROR',
-                4: 'WARNING', 5: 'NOTICE', 6: 'INFO', 7: 'DEBUG'
-            }
+            hostname = intern_source(match.group(4))
             
             return LogEntry(
-                timestamp=time.time(),
-                source=match.group(4),
-                level=level_map.get(severity, 'INFO'),
+                timestamp=now,
+                source=hostname,
+                level=LEVELS[severity],
                 message=match.group(8),
                 fields={
                     'facility': facility,
                     'severity': severity,
-                    'hostname': match.group(4),
+                    'hostname': hostname,
                     'app': match.group(5),
                     'pid': match.group(6)
                 },
@@ -128,15 +272,15 @@ class LogParser:
             )
         return None
     
-    def _parse_apache(self, data: str, source: str) -> Optional[LogEntry]:
+    def _parse_apache(self, data: str, source: str, now: float) -> Optional[LogEntry]:
         """Parse Apache/Nginx common log format."""
-        match = self.apache_pattern.match(data)
+        match = self.APACHE_PATTERN.match(data)
         if match:
             status_code = int(match.group(6))
             level = 'ERROR' if status_code >= 400 else 'INFO'
             
             return LogEntry(
-                timestamp=time.time(),
+                timestamp=now,
                 source=source,
                 level=level,
                 message=f"{match.group(3)} {match.group(4)}",
@@ -153,24 +297,24 @@ class LogParser:
             )
         return None
     
-    def _parse_plain(self, data: str, source: str) -> LogEntry:
+    def _parse_plain(self, data: str, source: str, now: float) -> LogEntry:
         """Parse plain text log."""
         # Extract key=value pairs
         fields = {}
-        pattern = re.compile(r'(\w+)=([^\s]+)')
-        for match in pattern.finditer(data):
-            fields[match.group(1)] = match.group(2)
+        if '=' in data:
+            for match in self.KV_PATTERN.finditer(data):
+                fields[match.group(1)] = match.group(2)
         
         # Detect log level
         level = 'INFO'
         data_lower = data.lower()
-        for lvl in ['error', 'warning', 'critical', 'debug']:
+        for lvl in ('error', 'warning', 'critical', 'debug'):
             if lvl in data_lower:
-                level = lvl.upper()
+                level = LEVEL_LOOKUP[lvl]
                 break
         
         return LogEntry(
-            timestamp=time.time(),
+            timestamp=now,
             source=source,
             level=level,
             message=data.strip(),
@@ -179,6 +323,119 @@ class LogParser:
         )
 
 
+class SlidingWindow:
+    """Level counts and time bounds of the logs seen in the last `size` seconds.
+    
+    Timestamps and level ids sit in parallel typed arrays used as rings,
+    about a dozen bytes per log instead of a tuple of Python objects. Two
+    monotonic queues of ring positions give the oldest and newest
+    timestamp in O(1) even when logs arrive out of order.
+    """
+    
+    MIN_CAPACITY = 64
+    
+    def __init__(self, size: float):
+        self.size = size
+        self.level_index = {}
+        self.level_names = []
+        self.level_counts = []
+        # Positions count up forever; position p lives at index p & mask
+        self.mask = self.MIN_CAPACITY - 1
+        self.head = self.tail = 0
+        self.min_head = self.min_tail = 0
+        self.max_head = self.max_tail = 0
+        self.times = self._allocate('d', self.MIN_CAPACITY)
+        self.level_ids = self._allocate('I', self.MIN_CAPACITY)
+        self.mins = self._allocate('q', self.MIN_CAPACITY)
+        self.maxes = self._allocate('q', self.MIN_CAPACITY)
+    
+    def add(self, timestamp: float, level: str) -> Tuple[int, Dict[str, int], float, float]:
+        """Add a log and expire older ones; return count, levels, start and end."""
+        times, level_ids, mins, maxes = self.times, self.level_ids, self.mins, self.maxes
+        counts = self.level_counts
+        mask = self.mask
+        head, tail = self.head, self.tail
+        min_head, min_tail = self.min_head, self.min_tail
+        max_head, max_tail = self.max_head, self.max_tail
+        cutoff_time = timestamp - self.size
+        
+        # Remove old entries
+        while head != tail and times[head & mask] <= cutoff_time:
+            counts[level_ids[head & mask]] -= 1
+            if mins[min_head & mask] == head:
+                min_head += 1
+            if maxes[max_head & mask] == head:
+                max_head += 1
+            head += 1
+        
+        capacity = mask + 1
+        live = tail - head
+        if live == capacity or (capacity > self.MIN_CAPACITY and live < capacity // 4):
+            self.head, self.min_head, self.max_head = head, min_head, max_head
+            self._resize(capacity * 2 if live == capacity else capacity // 2)
+            return self.add(timestamp, level)
+        
+        level_id = self.level_index.get(level)
+        if level_id is None:
+            level_id = self.level_index[level] = len(counts)
+            self.level_names.append(level)
+            counts.append(0)
+        
+        times[tail & mask] = timestamp
+        level_ids[tail & mask] = level_id
+        counts[level_id] += 1
+        while min_tail != min_head and times[mins[(min_tail - 1) & mask] & mask] >= timestamp:
+            min_tail -= 1
+        mins[min_tail & mask] = tail
+        min_tail += 1
+        while max_tail != max_head and times[maxes[(max_tail - 1) & mask] & mask] <= timestamp:
+            max_tail -= 1
+        maxes[max_tail & mask] = tail
+        max_tail += 1
+        tail += 1
+        
+        self.head, self.tail = head, tail
+        self.min_head, self.min_tail = min_head, min_tail
+        self.max_head, self.max_tail = max_head, max_tail
+        
+        levels = {
+            name: count
+            for name, count in zip(self.level_names, counts)
+            if count
+        }
+        return (
+            tail - head, levels,
+            times[mins[min_head & mask] & mask], times[maxes[max_head & mask] & mask]
+        )
+    
+    @staticmethod
+    def _allocate(typecode: str, capacity: int) -> array:
+        return array(typecode, bytes(capacity * array(typecode).itemsize))
+    
+    def _resize(self, capacity: int):
+        """Move every ring into arrays of a new capacity, keeping positions."""
+        mask = capacity - 1
+        
+        def move(data: array, head: int, tail: int) -> array:
+            size = tail - head
+            start = head & self.mask
+            items = data[start:start + size]
+            if len(items) < size:
+                items += data[:size - len(items)]
+            moved = self._allocate(data.typecode, capacity)
+            start = head & mask
+            split = min(size, capacity - start)
+            moved[start:start + split] = items[:split]
+            moved[:size - split] = items[split:]
+            return moved
+        
+        self.times = move(self.times, self.head, self.tail)
+        self.level_ids = move(self.level_ids, self.head, self.tail)
+        self.mins = move(self.mins, self.min_head, self.min_tail)
+        self.maxes = move(self.maxes, self.max_head, self.max_tail)
+        self.mask = mask
+
+
 class LogAggregator:
     """Aggregates logs using time windows."""
     
@@ -189,92 +446,175 @@ class LogAggregator:
     def add_window(self, name: str, window_type: str, size: int):
         """Add an aggregation window."""
         with self.lock:
-            self.windows[name] = {
+            window = {
                 'type': window_type,
                 'size': size,
-                'data': defaultdict(list),
-                'start_time': time.time()
+                'start_time': time.time(),
+                'lock': threading.Lock()
             }
+            if window_type == 'tumbling':
+                # Running counters per interval id
+                window['buckets'] = {}
+                window['current_id'] = None
+            elif window_type == 'sliding':
+                window['state'] = SlidingWindow(size)
+            # Copy on write so process() can iterate without the lock
+            self.windows = {**self.windows, name: window}
     
     def process(self, log: LogEntry) -> Dict[str, Any]:
         """Process log through aggregation windows."""
         results = {}
         
-        with self.lock:
-            for name, window in self.windows.items():
-                if window['type'] == 'tumbling':
-                    # Fixed interval windows
-                    window_id = int(log.timestamp // window['size'])
-                    window['data'][window_id].append(log)
-                    results[name] = self._calculate_metrics(window['data'][window_id])
-                
-                elif window['type'] == 'sliding':
-                    # Overlapping windows
-                    current_time = log.timestamp
-                    cutoff_time = current_time - window['size']
-                    
-                    # Remove old entries
-                    for wid in list(window['data'].keys()):
-                        window['data'][wid] = [
-                            l for l in window['data'][wid]
-                            if l.timestamp > cutoff_time
-                        ]
-                    
-                    window['data'][0].append(log)
-                    results[name] = self._calculate_metrics(window['data'][0])
+        # Each window has its own lock, so threads only contend per window
+        for name, window in self.windows.items():
+            if window['type'] == 'tumbling':
+                with window['lock']:
+                    results[name] = self._process_tumbling(window, log)
+            elif window['type'] == 'sliding':
+                with window['lock']:
+                    results[name] = self._process_sliding(window, log)
         
         return results
     
-    def _calculate_metrics(self, logs: List[LogEntry]) -> Dict[str, Any]:
-        """Calculate metrics for a window."""
-        if not logs:
-            return {'count': 0}
+    def _process_tumbling(self, window: Dict, log: LogEntry) -> Dict[str, Any]:
+        """Add a log to its fixed interval window."""
+        window_id = int(log.timestamp // window['size'])
+        buckets = window['buckets']
+        bucket = buckets.get(window_id)
         
-        levels = defaultdict(int)
-        for log in logs:
-            levels[log.level] += 1
+        if bucket is None:
+            bucket = buckets[window_id] = {
+                'count': 0,
+                'levels': Counter(),
+                'start_time': log.timestamp,
+                'end_time': log.timestamp
+            }
+            if window['current_id'] is None or window_id > window['current_id']:
+                # Closed windows are never reported again
+                window['current_id'] = window_id
+                for wid in [wid for wid in buckets if wid < window_id]:
+                    del buckets[wid]
+        
+        bucket['count'] += 1
+        bucket['levels'][log.level] += 1
+        bucket['start_time'] = min(bucket['start_time'], log.timestamp)
+        bucket['end_time'] = max(bucket['end_time'], log.timestamp)
         
+        return self._calculate_metrics(
+            bucket['count'], bucket['levels'], bucket['start_time'], bucket['end_time']
+        )
+    
+    def _process_sliding(self, window: Dict, log: LogEntry) -> Dict[str, Any]:
+        """Add a log to an overlapping window, expiring entries older than its size."""
+        return self._calculate_metrics(*window['state'].add(log.timestamp, log.level))
+    
+    def _calculate_metrics(self, count: int, levels: Dict[str, int],
+                           start_time: float, end_time: float) -> Dict[str, Any]:
+        """Build the metrics for a window from its running counters."""
         return {
-            'count': len(logs),
+            'count': count,
             'levels': dict(levels),
-            'start_time': min(log.timestamp for log in logs),
-            'end_time': max(log.timestamp for log in logs)
+            'start_time': start_time,
+            'end_time': end_time
         }
 
 
 class AlertManager:
     """Manages alerts based on rules."""
     
+    # Characters that make a pattern more than a plain literal
+    REGEX_SYNTAX = set('\\^$.|?*+()[]{}')
+    
     def __init__(self):
         self.rules = []
         self.alerts = deque(maxlen=1000)
         self.lock = threading.Lock()
+        # One automaton over the literals of every literal pattern rule,
+        # mapping each literal to the indexes of the rules it belongs to,
+        # and the rules it does not cover
+        self.automaton = None
+        self.scanned_rules = []
     
     def add_rule(self, rule: Dict[str, Any]):
         """Add an alert rule."""
+        rule = dict(rule)
+        if rule.get('type') == 'pattern' and rule.get('pattern'):
+            # Compile once here instead of on every checked log
+            rule['_compiled'] = re.compile(rule['pattern'])
+            if AHOCORASICK_AVAILABLE:
+                rule['_literals'] = self._literal_alternatives(rule['pattern'])
         with self.lock:
-            self.rules.append(rule)
+            rule['_index'] = len(self.rules)
+            rules = self.rules + [rule]
+            if rule.get('_literals'):
+                self.automaton = self._build_automaton(rules)
+            else:
+                self.scanned_rules = self.scanned_rules + [rule]
+            # Copy on write so check() can read the rules without the lock
+            self.rules = rules
+    
+    @classmethod
+    def _literal_alternatives(cls, pattern: str) -> Optional[List[str]]:
+        """Return the literals of a 'foo', '(foo|bar)' or '(?:foo|bar)' pattern."""
+        if pattern.startswith('(') and pattern.endswith(')'):
+            pattern = pattern[1:-1]
+            if pattern.startswith('?:'):
+                pattern = pattern[2:]
+        literals = pattern.split('|')
+        for literal in literals:
+            if not literal or not cls.REGEX_SYNTAX.isdisjoint(literal):
+                return None
+        return literals
+    
+    @staticmethod
+    def _build_automaton(rules: List[Dict]) -> 'ahocorasick.Automaton':
+        """Build one Aho-Corasick automaton over all literal pattern rules."""
+        owners = {}
+        for rule in rules:
+            for literal in rule.get('_literals') or ():
+                owners.setdefault(literal, set()).add(rule['_index'])
+        automaton = ahocorasick.Automaton()
+        for literal, indexes in owners.items():
+            automaton.add_word(literal, tuple(indexes))
+        automaton.make_automaton()
+        return automaton
     
     def check(self, log: LogEntry, metrics: Dict[str, Any]) -> List[Dict]:
         """Check if log triggers any alerts."""
         triggered = []
+        rules = self.rules
         
-        with self.lock:
-            for rule in self.rules:
-                if self._evaluate_rule(rule, log, metrics):
-                    alert = {
-                        'timestamp': time.time(),
-                        'rule': rule['name'],
-                        'type': rule['type'],
-                        'log': log.to_dict(),
-                        'metrics': metrics
-                    }
-                    self.alerts.append(alert)
-                    triggered.append(alert)
+        # Scan the message once for every literal pattern rule; only the
+        # rules it matched and the rules it cannot handle are evaluated
+        candidates = self.scanned_rules
+        automaton = self.automaton
+        matched = set()
+        if automaton is not None:
+            for _, indexes in automaton.iter(log.message):
+                matched.update(indexes)
+            if matched:
+                candidates = sorted(
+                    candidates + [rules[index] for index in matched if index < len(rules)],
+                    key=lambda rule: rule['_index']
+                )
+        
+        # Rules are never mutated in place and deque appends are atomic
+        for rule in candidates:
+            if self._evaluate_rule(rule, log, metrics, matched):
+                alert = {
+                    'timestamp': time.time(),
+                    'rule': rule['name'],
+                    'type': rule['type'],
+                    'log': log.to_dict(),
+                    'metrics': metrics
+                }
+                self.alerts.append(alert)
+                triggered.append(alert)
         
         return triggered
     
-    def _evaluate_rule(self, rule: Dict, log: LogEntry, metrics: Dict) -> bool:
+    def _evaluate_rule(self, rule: Dict, log: LogEntry, metrics: Dict,
+                       matched: set = frozenset()) -> bool:
         """Evaluate if a rule is triggered."""
         rule_type = rule.get('type')
         
@@ -295,8 +635,10 @@ class AlertManager:
         
         elif rule_type == 'pattern':
             # Check pattern matching
-            pattern = rule.get('pattern')
-            if pattern and re.search(pattern, log.message):
+            if rule.get('_literals'):
+                return rule['_index'] in matched
+            pattern = rule.get('_compiled')
+            if pattern and pattern.search(log.message):
                 return True
         
         elif rule_type == 'anomaly':
@@ -313,58 +655,235 @@ class AlertManager:
 
 
 class LogStorage:
-    """Stores logs with retention policies."""
+    """Stores logs with retention policies.
+    
+    Logs go to one SQLite file per UTC day of arrival (logs_YYYYMMDD.db next
+    to db_path), so time-based retention unlinks whole files instead of
+    deleting rows. db_path itself keeps the compression dictionaries and,
+    for databases created before partitioning, the original logs table.
+    """
+    
+    # Wake the writer once this many rows are pending
+    FLUSH_ROWS = 1024
+    # Rows per executemany call
+    MAX_BATCH = 4096
+    # Seconds between writer flushes when traffic is light
+    FLUSH_INTERVAL = 0.05
+    # Rows compressed per retention pass
+    COMPRESS_BATCH = 1000
+    # Rows sampled to train the compression dictionary, and its size
+    DICT_SAMPLES = 10000
+    DICT_SIZE = 131072
+    # 'compressed' column value for rows from the old gzip+hex scheme
+    LEGACY_GZIP = -1
+    # Day partitions kept open at once; older ones are reopened on demand
+    MAX_OPEN_PARTITIONS = 8
+    # Partition key of the logs table inside db_path itself
+    LEGACY = -1
+    
+    INSERT_SQL = '''
+        INSERT INTO logs (timestamp, source, level, message, fields, raw, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
     
     def __init__(self, db_path: str = 'logs.db'):
         self.db_path = db_path
+        self.in_memory = db_path == ':memory:'
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self.lock = threading.Lock()
+        # zstd dictionaries by id, loaded on first use
+        self._dictionaries = {}
+        # Every partition by day number, and the open ones in LRU order
+        self._days = set()
+        self._open = OrderedDict()
         self._init_db()
+        
+        # Rows waiting for the writer thread
+        self._queue = deque()
+        self._flush_event = threading.Event()
+        self._writer_thread = threading.Thread(target=self._writer, daemon=True)
+        self._writer_thread.start()
     
     def _init_db(self):
-        """Initialize database schema."""
+        """Initialize database schema and find existing partitions."""
         with self.lock:
             cursor = self.conn.cursor()
+            self._configure(cursor)
+            # zstd dictionaries; logs.compressed is 0 for plain rows and
+            # otherwise the id of the dictionary the row was compressed with
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS logs (
+                CREATE TABLE IF NOT EXISTS log_dicts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL,
-                    source TEXT,
-                    level TEXT,
-                    message TEXT,
-                    fields TEXT,
-                    raw TEXT,
-                    created_at REAL
+                    data BLOB
                 )
             ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_timestamp ON logs(timestamp)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_level ON logs(level)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_source ON logs(source)
-            ''')
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs'")
+            if cursor.fetchone():
+                # Written before partitioning; still queried and expired
+                self._init_partition(self.conn)
+                self._days.add(self.LEGACY)
             self.conn.commit()
+            
+            if not self.in_memory:
+                path = Path(self.db_path)
+                for file in path.parent.glob(f'{path.stem}_*{path.suffix}'):
+                    date = file.stem[len(path.stem) + 1:]
+                    if len(date) == 8 and date.isdigit():
+                        start = datetime.strptime(date, '%Y%m%d').replace(tzinfo=timezone.utc)
+                        self._days.add(int(start.timestamp()) // 86400)
+    
+    @staticmethod
+    def _configure(cursor: sqlite3.Cursor):
+        """Apply the connection settings shared by every database file."""
+        # WAL lets queries read while the writer appends; NORMAL syncs
+        # at checkpoints rather than on every commit
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    
+    def _init_partition(self, conn: sqlite3.Connection):
+        """Create the logs table and its indexes in a partition."""
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL,
+                source TEXT,
+                level TEXT,
+                message TEXT,
+                fields TEXT,
+                raw TEXT,
+                created_at REAL,
+                compressed INTEGER DEFAULT 0
+            )
+        ''')
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(logs)")]
+        if 'compressed' not in columns:
+            # Databases from before per-row compression tracking
+            cursor.execute("ALTER TABLE logs ADD COLUMN compressed INTEGER DEFAULT 0")
+            cursor.execute(
+                "UPDATE logs SET compressed = ? WHERE raw LIKE 'COMPRESSED:%'",
+                (self.LEGACY_GZIP,)
+            )
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_timestamp ON logs(timestamp)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_level ON logs(level)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_source ON logs(source)
+        ''')
+        # Rows leave this index once compressed
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_uncompressed ON logs(created_at)
+            WHERE compressed = 0
+        ''')
+        conn.commit()
+    
+    def _partition_path(self, day: int) -> str:
+        """File of the partition for a day number (days since the epoch)."""
+        if self.in_memory:
+            return ':memory:'
+        path = Path(self.db_path)
+        date = time.strftime('%Y%m%d', time.gmtime(day * 86400))
+        return str(path.with_name(f'{path.stem}_{date}{path.suffix}'))
+    
+    def _connection(self, day: int) -> sqlite3.Connection:
+        """Connection to a partition, opening or creating it as needed."""
+        if day == self.LEGACY:
+            return self.conn
+        conn = self._open.get(day)
+        if conn is not None:
+            self._open.move_to_end(day)
+            return conn
+        
+        conn = sqlite3.connect(self._partition_path(day), check_same_thread=False)
+        self._configure(conn.cursor())
+        self._init_partition(conn)
+        self._open[day] = conn
+        self._days.add(day)
+        # In-memory partitions only exist while their connection is open
+        if not self.in_memory and len(self._open) > self.MAX_OPEN_PARTITIONS:
+            _, oldest = self._open.popitem(last=False)
+            oldest.close()
+        return conn
+    
+    def _drop_partition(self, day: int):
+        """Close and delete a whole day partition."""
+        conn = self._open.pop(day, None)
+        if conn is not None:
+            conn.close()
+        self._days.discard(day)
+        if not self.in_memory:
+            path = self._partition_path(day)
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.unlink(path + suffix)
+                except FileNotFoundError:
+                    pass
+    
+    @staticmethod
+    def _row(log: LogEntry, created_at: float) -> Tuple:
+        """Build the insert row for a log entry."""
+        return (
+            log.timestamp,
+            log.source,
+            log.level,
+            log.message,
+            dumps_json(log.fields),
+            log.raw,
+            created_at
+        )
+    
+    def store(self, log: LogEntry, created_at: Optional[float] = None):
+        """Queue a log entry for the writer thread."""
+        # Serialize here so the writer only does I/O
+        self._queue.append(self._row(log, created_at or time.time()))
+        if len(self._queue) >= self.FLUSH_ROWS:
+            self._flush_event.set()
     
-    def store(self, log: LogEntry):
-        """Store a log entry."""
+    def store_many(self, logs: List[LogEntry], wait: bool = True,
+                   created_at: Optional[float] = None):
+        """Store log entries with one statement and one commit.
+        
+        With wait=False the entries are left to the writer thread instead.
+        """
+        created_at = created_at or time.time()
+        self._queue.extend(self._row(log, created_at) for log in logs)
+        if wait:
+            self.flush()
+        elif len(self._queue) >= self.FLUSH_ROWS:
+            self._flush_event.set()
+    
+    def flush(self):
+        """Write all queued entries."""
         with self.lock:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO logs (timestamp, source, level, message, fields, raw, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                log.timestamp,
-                log.source,
-                log.level,
-                log.message,
-                json.dumps(log.fields),
-                log.raw,
-                time.time()
-            ))
-            self.conn.commit()
+            self._drain()
+    
+    def _drain(self):
+        """Write queued entries in batches to their day; caller holds the lock."""
+        while self._queue:
+            count = min(len(self._queue), self.MAX_BATCH)
+            by_day = {}
+            for _ in range(count):
+                row = self._queue.popleft()
+                by_day.setdefault(int(row[6] // 86400), []).append(row)
+            for day, rows in by_day.items():
+                conn = self._connection(day)
+                conn.executemany(self.INSERT_SQL, rows)
+                conn.commit()
+    
+    def _writer(self):
+        """Flush queued entries when enough pile up or the interval passes."""
+        while True:
+            self._flush_event.wait(self.FLUSH_INTERVAL)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error writing log batch: {e}")
     
     def query(self, 
               start_time: Optional[float] = None,
@@ -375,6 +894,9 @@ class LogStorage:
               limit: int = 100) -> List[Dict]:
         """Query stored logs."""
         with self.lock:
+            # Make queued entries visible to the query
+            self._drain()
+            
             query = "SELECT * FROM logs WHERE 1=1"
             params = []
             
@@ -401,14 +923,38 @@ class LogStorage:
             query += " ORDER BY timestamp DESC LIMIT ?"
             params.append(limit)
             
-            cursor = self.conn.cursor()
-            cursor.execute(query, params)
+            # Log timestamps are not tied to the arrival day, so every
+            # partition is asked for its newest rows and the lists merged
+            columns = None
+            partitions = []
+            for day in sorted(self._days, reverse=True):
+                cursor = self._connection(day).execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                partitions.append(cursor.fetchall())
+            if columns is None:
+                return []
+            if len(partitions) == 1:
+                rows = partitions[0]
+            else:
+                position = columns.index('timestamp')
+                rows = heapq.merge(*partitions, key=lambda row: sqlite_order_key(row[position]),
+                                   reverse=True)
             
-            columns = [desc[0] for desc in cursor.description]
             results = []
-            for row in cursor.fetchall():
+            decompressors = {}
+            for row in islice(rows, limit):
                 result = dict(zip(columns, row))
-                result['fields'] = json.loads(result['fields'])
+                result['fields'] = loads_json(result['fields'])
+                dict_id = result.pop('compressed')
+                if dict_id > 0:
+                    decompressor = decompressors.get(dict_id)
+                    if decompressor is None:
+                        decompressor = zstd.ZstdDecompressor(dict_data=self._dictionary(dict_id))
+                        decompressors[dict_id] = decompressor
+                    result['raw'] = decompressor.decompress(result['raw']).decode()
+                elif result['raw'] is None:
+                    # Entries submitted structured are stored without raw
+                    result['raw'] = dump_raw(result)
                 results.append(result)
             
             return results
@@ -416,31 +962,47 @@ class LogStorage:
     def apply_retention(self, policy: Dict[str, Any]):
         """Apply retention policy."""
         with self.lock:
-            cursor = self.conn.cursor()
+            self._drain()
             
             if policy.get('type') == 'time':
                 # Time-based retention
                 days = policy.get('days', 7)
                 cutoff = time.time() - (days * 86400)
-                cursor.execute("DELETE FROM logs WHERE created_at < ?", (cutoff,))
+                for day in sorted(self._days):
+                    if day != self.LEGACY and (day + 1) * 86400 <= cutoff:
+                        # Everything in it arrived before the cutoff
+                        self._drop_partition(day)
+                    elif day == self.LEGACY or day * 86400 < cutoff:
+                        conn = self._connection(day)
+                        conn.execute("DELETE FROM logs WHERE created_at < ?", (cutoff,))
+                        conn.commit()
             
             elif policy.get('type') == 'size':
                 # Size-based retention
                 max_size = policy.get('max_size_mb', 1000) * 1024 * 1024
                 
                 # Get current database size
-                cursor.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()")
-                current_size = cursor.fetchone()[0]
+                current_size = sum(
+                    self._connection(day).execute(
+                        "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+                    ).fetchone()[0]
+                    for day in sorted(self._days)
+                )
                 
-                if current_size > max_size:
-                    # Delete oldest logs
-                    cursor.execute("""
-                        DELETE FROM logs WHERE id IN (
-                            SELECT id FROM logs ORDER BY timestamp ASC LIMIT ?
-                        )
-                    """, (10000,))  # Delete 10k oldest logs
-            
-            self.conn.commit()
+                days = sorted(self._days)
+                if current_size > max_size and days:
+                    if days[0] != self.LEGACY and len(days) > 1:
+                        # Drop the oldest day, but never the one being written
+                        self._drop_partition(days[0])
+                    else:
+                        # Delete oldest logs
+                        conn = self._connection(days[0])
+                        conn.execute("""
+                            DELETE FROM logs WHERE id IN (
+                                SELECT id FROM logs ORDER BY timestamp ASC LIMIT ?
+                            )
+                        """, (10000,))  # Delete 10k oldest logs
+                        conn.commit()
             
             # Compress old data
             if policy.get('compress', False):
@@ -449,36 +1011,92 @@ class LogStorage:
     def _compress_old_data(self, days: int):
         """Compress old log data."""
         cutoff = time.time() - (days * 86400)
-        cursor = self.conn.cursor()
+        remaining = self.COMPRESS_BATCH
         
-        # Select old uncompressed logs
-        cursor.execute("""
-            SELECT id, raw FROM logs 
-            WHERE created_at < ? AND raw NOT LIKE 'COMPRESSED:%'
-            LIMIT 1000
-        """, (cutoff,))
-        
-        # Batch updates for better performance
-        updates = []
-        for row in cursor.fetchall():
-            log_id, raw = row
-            compressed = gzip.compress(raw.encode())
-            compressed_str = f"COMPRESSED:{compressed.hex()}"
-            updates.append((compressed_str, log_id))
-        
-        # Execute batch update
-        if updates:
+        for day in sorted(self._days):
+            if day != self.LEGACY and day * 86400 >= cutoff:
+                # This and later partitions only hold newer rows
+                break
+            conn = self._connection(day)
+            cursor = conn.cursor()
+            
+            # Select old uncompressed logs
+            cursor.execute("""
+                SELECT id, raw FROM logs
+                WHERE compressed = 0 AND created_at < ? AND raw IS NOT NULL
+                LIMIT ?
+            """, (cutoff, remaining))
+            rows = cursor.fetchall()
+            if not rows:
+                continue
+            
+            dict_id = self._current_dictionary(conn)
+            if dict_id is None:
+                return
+            compressor = zstd.ZstdCompressor(level=3, dict_data=self._dictionary(dict_id))
+            
+            # Batch updates for better performance
+            updates = [
+                (compressor.compress(raw.encode()), dict_id, log_id)
+                for log_id, raw in rows
+            ]
             cursor.executemany(
-                "UPDATE logs SET raw = ? WHERE id = ?",
+                "UPDATE logs SET raw = ?, compressed = ? WHERE id = ?",
                 updates
             )
+            conn.commit()
+            
+            remaining -= len(rows)
+            if not remaining:
+                return
+    
+    def _current_dictionary(self, conn: sqlite3.Connection) -> Optional[int]:
+        """Id of the newest zstd dictionary, training one on conn's logs if none exists yet."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id FROM log_dicts ORDER BY id DESC LIMIT 1")
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        
+        rows = conn.execute(
+            "SELECT raw FROM logs WHERE compressed = 0 AND raw IS NOT NULL LIMIT ?",
+            (self.DICT_SAMPLES,)
+        ).fetchall()
+        samples = [raw.encode() for (raw,) in rows]
+        try:
+            data = zstd.train_dictionary(self.DICT_SIZE, samples).as_bytes()
+        except zstd.ZstdError as e:
+            # Too few samples so far; retry on a later pass
+            logger.info(f"Skipping compression, dictionary training failed: {e}")
+            return None
         
+        cursor.execute("INSERT INTO log_dicts (data) VALUES (?)", (data,))
         self.conn.commit()
+        return cursor.lastrowid
+    
+    def _dictionary(self, dict_id: int) -> zstd.ZstdCompressionDict:
+        """Load a zstd dictionary by id."""
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT data FROM log_dicts WHERE id = ?", (dict_id,))
+            dictionary = zstd.ZstdCompressionDict(cursor.fetchone()[0])
+            self._dictionaries[dict_id] = dictionary
+        return dictionary
 
 
 class LogPipeline:
     """Main log aggregation pipeline."""
     
+    # Most records the network receivers hand to process_logs at once
+    RECEIVE_BATCH = 1024
+    # Longest TCP line accepted (asyncio's default readline limit)
+    MAX_LINE = 65536
+    # Kernel receive buffer requested for the UDP socket
+    UDP_RECEIVE_BUFFER = 16 * 1024 * 1024
+    # Shortest interval logs_per_second is measured over
+    RATE_INTERVAL_NS = 1_000_000_000
+    
     def __init__(self):
         self.parser = LogParser()
         self.aggregator = LogAggregator()
@@ -494,6 +1112,8 @@ class LogPipeline:
             'alerts_triggered': 0
         }
         self.stats_lock = threading.Lock()
+        # (monotonic ns, total_logs) when logs_per_second was last computed
+        self._rate_sample = (time.monotonic_ns(), 0)
         
         # Setup default aggregation windows
         self.aggregator.add_window('1min', 'tumbling', 60)
@@ -514,11 +1134,21 @@ class LogPipeline:
     def process_log(self, data: str, source: str = 'unknown'):
         """Process a single log entry."""
         try:
-            # Parse log
-            log = self.parser.parse(data, source)
-            if not log:
-                return
-            
+            # Parse log; one clock read serves parsing and storage
+            now = time.time()
+            log = self.parser.parse(data, source, now)
+        except Exception as e:
+            logger.error(f"Error processing log: {e}")
+            with self.stats_lock:
+                self.stats['errors'] += 1
+            return
+        
+        if log:
+            self.process_entry(log, now)
+    
+    def process_entry(self, log: LogEntry, now: Optional[float] = None):
+        """Process an already structured log entry."""
+        try:
             # Update stats
             with self.stats_lock:
                 self.stats['total_logs'] += 1
@@ -534,30 +1164,125 @@ class LogPipeline:
                 logger.info(f"Alerts triggered: {len(alerts)}")
             
             # Store
-            self.storage.store(log)
+            self.storage.store(log, now)
             
         except Exception as e:
             logger.error(f"Error processing log: {e}")
             with self.stats_lock:
                 self.stats['errors'] += 1
     
+    def process_logs(self, records: List[Tuple[str, str]], wait: bool = True) -> List[int]:
+        """Process a batch of (data, source) records.
+        
+        Parsed logs are stored with a single write, or queued for the storage
+        writer thread with wait=False. Returns the indices of records that
+        failed.
+        """
+        parsed = []
+        parsed_indices = []
+        failed = []
+        # One clock read for the whole batch
+        now = time.time()
+        
+        for i, (data, source) in enumerate(records):
+            try:
+                log = self.parser.parse(data, source, now)
+            except Exception as e:
+                logger.error(f"Error processing log: {e}")
+                failed.append(i)
+                continue
+            if log:
+                parsed.append(log)
+                parsed_indices.append(i)
+        
+        if failed:
+            with self.stats_lock:
+                self.stats['errors'] += len(failed)
+        
+        failed.extend(parsed_indices[j] for j in self.process_entries(parsed, wait, now))
+        failed.sort()
+        return failed
+    
+    def process_entries(self, logs: List[LogEntry], wait: bool = True,
+                        now: Optional[float] = None) -> List[int]:
+        """Process a batch of structured log entries.
+        
+        Logs are stored with a single write, or queued for the storage writer
+        thread with wait=False (storage errors are then only logged). Returns
+        the indices of entries that failed.
+        """
+        stored = []
+        stored_indices = []
+        failed = []
+        alerts_triggered = 0
+        
+        for i, log in enumerate(logs):
+            try:
+                metrics = self.aggregator.process(log)
+                alerts_triggered += len(self.alert_manager.check(log, metrics))
+                stored.append(log)
+                stored_indices.append(i)
+            except Exception as e:
+                logger.error(f"Error processing log: {e}")
+                failed.append(i)
+        
+        try:
+            if stored:
+                self.storage.store_many(stored, wait, now)
+        except Exception as e:
+            logger.error(f"Error storing log batch: {e}")
+            failed.extend(stored_indices)
+            failed.sort()
+        
+        if alerts_triggered:
+            logger.info(f"Alerts triggered: {alerts_triggered}")
+        
+        # Update stats once for the whole batch
+        with self.stats_lock:
+            self.stats['total_logs'] += len(logs)
+            self.stats['alerts_triggered'] += alerts_triggered
+            self.stats['errors'] += len(failed)
+        
+        return failed
+    
     async def start_tcp_server(self, port: int = 5514):
         """Start TCP log receiver."""
         async def handle_client(reader, writer):
             addr = writer.get_extra_info('peername')
             logger.info(f"TCP client connected from {addr}")
+            source = sys.intern(f"tcp:{addr[0]}")
+            # Reused across reads; only the incomplete last line stays in it
+            buffer = bytearray()
             
             try:
                 while True:
-                    data = await reader.readline()
+                    data = await reader.read(self.MAX_LINE)
                     if not data:
                         break
                     
-                    self.executor.submit(
-                        self.process_log,
-                        data.decode('utf-8').strip(),
-                        f"tcp:{addr[0]}"
+                    buffer += data
+                    end = buffer.rfind(b'\n')
+                    if end < 0:
+                        if len(buffer) > self.MAX_LINE:
+                            raise ValueError("Line exceeds maximum length")
+                        continue
+                    
+                    # Decode every complete line from this read at once (a
+                    # newline byte never occurs inside a UTF-8 sequence) and
+                    # process them as one batch, inline; storage writes go
+                    # to the writer thread
+                    text = buffer[:end].decode('utf-8')
+                    del buffer[:end + 1]
+                    if len(buffer) > self.MAX_LINE:
+                        raise ValueError("Line exceeds maximum length")
+                    self.process_logs(
+                        [(line.strip(), source) for line in text.split('\n')],
+                        wait=False
                     )
+                
+                # Last line without a trailing newline
+                if buffer:
+                    self.process_logs([(buffer.decode('utf-8').strip(), source)], wait=False)
             except Exception as e:
                 logger.error(f"TCP client error: {e}")
             finally:
@@ -570,53 +1295,128 @@ class LogPipeline:
         async with server:
             await server.serve_forever()
     
-    def start_udp_server(self, port: int = 514, shutdown_event=None):
-        """Start UDP syslog receiver."""
+    async def start_udp_server(self, port: int = 514) -> 'UDPLogReceiver':
+        """Start UDP syslog receiver on the running event loop."""
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._grow_receive_buffer(sock)
         sock.bind(('0.0.0.0', port))
-        sock.settimeout(1.0)  # Set timeout to check shutdown periodically
+        receiver = UDPLogReceiver(self, sock)
+        receiver.start(asyncio.get_running_loop())
         logger.info(f"UDP server listening on port {port}")
+        return receiver
+    
+    def _grow_receive_buffer(self, sock: socket.socket):
+        """Enlarge the kernel buffer that holds datagrams not yet read."""
+        # SO_RCVBUFFORCE may exceed net.core.rmem_max but needs
+        # CAP_NET_ADMIN; SO_RCVBUF is silently capped at rmem_max
+        force = getattr(socket, 'SO_RCVBUFFORCE', None)
+        try:
+            if force is None:
+                raise PermissionError
+            sock.setsockopt(socket.SOL_SOCKET, force, self.UDP_RECEIVE_BUFFER)
+        except PermissionError:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.UDP_RECEIVE_BUFFER)
+        logger.info(
+            f"UDP receive buffer: {sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes"
+        )
+    
+    async def serve(self, tcp_port: int = 5514, udp_port: int = 514, shutdown_event=None):
+        """Run the TCP and UDP receivers on one event loop until shutdown."""
+        udp_receiver = await self.start_udp_server(udp_port)
+        tcp_task = asyncio.create_task(self.start_tcp_server(tcp_port))
         
-        while True:
-            # Check for shutdown signal
-            if shutdown_event and shutdown_event.is_set():
-                logger.info("UDP server shutting down...")
-                break
-                
-            try:
-                data, addr = sock.recvfrom(65535)
-                self.executor.submit(
-                    self.process_log,
-                    data.decode('utf-8').strip(),
-                    f"udp:{addr[0]}"
-                )
-            except socket.timeout:
-                continue  # Check shutdown event again
-            except Exception as e:
-                logger.error(f"UDP server error: {e}")
-        
-        sock.close()
+        try:
+            # Check for shutdown periodically
+            while not tcp_task.done():
+                if shutdown_event and shutdown_event.is_set():
+                    logger.info("Log receivers shutting down...")
+                    break
+                await asyncio.wait({tcp_task}, timeout=1.0)
+            
+            if tcp_task.done():
+                # Surface a failed TCP server (e.g. port in use)
+                tcp_task.result()
+        finally:
+            tcp_task.cancel()
+            udp_receiver.close()
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get pipeline statistics."""
+        """Get pipeline statistics.
+        
+        logs_per_second is worked out here, from the logs counted since the
+        previous sample, rather than by the ingest path.
+        """
+        now = time.monotonic_ns()
         with self.stats_lock:
+            sampled_at, sampled_total = self._rate_sample
+            elapsed = now - sampled_at
+            if elapsed >= self.RATE_INTERVAL_NS:
+                total = self.stats['total_logs']
+                self.stats['logs_per_second'] = (total - sampled_total) * 1e9 / elapsed
+                self._rate_sample = (now, total)
             return self.stats.copy()
 
 
+class UDPLogReceiver:
+    """Drains a non-blocking UDP socket whenever the event loop sees it readable.
+    
+    Every wakeup reads all queued datagrams (up to RECEIVE_BATCH) and
+    processes them as one batch, where a datagram transport would hand
+    over one datagram per loop iteration.
+    """
+    
+    # Largest UDP payload
+    MAX_DATAGRAM = 65535
+    
+    def __init__(self, pipeline: LogPipeline, sock: socket.socket):
+        self.pipeline = pipeline
+        self.sock = sock
+        self.loop = None
+    
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self.sock.setblocking(False)
+        self.loop = loop
+        loop.add_reader(self.sock.fileno(), self._read_ready)
+    
+    def close(self):
+        if self.loop is not None:
+            self.loop.remove_reader(self.sock.fileno())
+            self.loop = None
+        self.sock.close()
+    
+    def _read_ready(self):
+        records = []
+        recvfrom = self.sock.recvfrom
+        for _ in range(self.pipeline.RECEIVE_BATCH):
+            try:
+                data, addr = recvfrom(self.MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                logger.error(f"UDP server error: {e}")
+                break
+            try:
+                records.append((data.decode('utf-8').strip(), sys.intern(f"udp:{addr[0]}")))
+            except UnicodeDecodeError as e:
+                logger.error(f"UDP server error: {e}")
+        if records:
+            self.pipeline.process_logs(records, wait=False)
+
+
+def install_uvloop():
+    """Use uvloop for asyncio event loops when it is installed."""
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main():
     """Main entry point."""
     import signal
     
+    install_uvloop()
     pipeline = LogPipeline()
     shutdown_event = threading.Event()
     
-    # Start UDP server in background thread
-    udp_thread = threading.Thread(
-        target=pipeline.start_udp_server,
-        args=(514, shutdown_event)
-    )
-    udp_thread.start()
-    
     # Apply retention policy periodically
     def retention_worker():
         while not shutdown_event.is_set():
@@ -645,16 +1445,16 @@ def main():
     signal.signal(signal.SIGINT, handle_shutdown)
     signal.signal(signal.SIGTERM, handle_shutdown)
     
-    # Start TCP server (blocking)
+    # Run TCP and UDP receivers on one event loop (blocking)
     try:
-        asyncio.run(pipeline.start_tcp_server(5514))
+        asyncio.run(pipeline.serve(5514, 514, shutdown_event))
     except KeyboardInterrupt:
         pass
     finally:
         logger.info("Shutting down...")
         shutdown_event.set()
-        udp_thread.join(timeout=5)
         retention_thread.join(timeout=5)
+        pipeline.storage.flush()
 
 
 if __name__ == '__main__':
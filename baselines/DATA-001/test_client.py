@@ -6,17 +6,110 @@ Generates various types of logs and sends them to the aggregator.
 
 import os
 import json
+import itertools
+import asyncio
 import time
 import random
 import socket
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LEVEL_CUM_WEIGHTS = list(itertools.accumulate([10, 60, 20, 8, 2]))
+MESSAGES = {
+    "DEBUG": [
+        "Entering function process_request",
+        "Cache hit for key: user_123",
+        "SQL query executed in 23ms"
+    ],
+    "INFO": [
+        "User login successful",
+        "Order processed successfully",
+        "Database connection established",
+        "Cache warmed up"
+    ],
+    "WARNING": [
+        "High memory usage detected: 85%",
+        "Slow query detected: 5.2s",
+        "Rate limit approaching for user",
+        "Deprecated API endpoint called"
+    ],
+    "ERROR": [
+        "Failed to connect to database",
+        "Invalid authentication token",
+        "Payment processing failed",
+        "File not found: config.yml"
+    ],
+    "CRITICAL": [
+        "System out of memory",
+        "Database connection pool exhausted",
+        "Disk space critical: 95% full",
+        "Security breach detected"
+    ]
+}
+ERROR_CODES = ["E001", "E002", "E003"]
+DURATIONS_MS = range(10, 5001)
+
+SYSLOG_FACILITY = 16  # Local0
+SYSLOG_HOSTS = [f"server-{i}.example.com" for i in range(1, 11)]
+SYSLOG_APPS = ["nginx", "mysql", "redis", "app"]
+# Strings, so lines are built without an int-to-str conversion per field
+SYSLOG_PIDS = [str(pid) for pid in range(1000, 10000)]
+
+HTTP_METHODS = ["GET", "POST", "PUT", "DELETE"]
+HTTP_STATUSES = [200, 201, 400, 404, 500]
+HTTP_STATUS_CUM_WEIGHTS = list(itertools.accumulate([60, 10, 10, 15, 5]))
+# Client addresses are drawn from a fixed pool of formatted strings
+IP_POOL = [
+    ".".join(map(str, random.choices(range(1, 256), k=4)))
+    for _ in range(4096)
+]
+RESPONSE_SIZES = range(100, 100001)
+
+# What each generated log is and how it is sent: a third each JSON,
+# syslog and Apache, with JSON split evenly between HTTP and TCP
+SEND_KINDS = ["json_http", "json_tcp", "syslog", "apache"]
+SEND_KIND_WEIGHTS = [1, 1, 2, 2]
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def dumps_json(obj):
+    """Serialize to JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
 class LogGenerator:
     """Generates test logs."""
     
+    # TCP lines are written once this many lines or bytes are buffered
+    TCP_BATCH_LINES = 64
+    TCP_BATCH_BYTES = 16 * 1024
+    # HTTP logs per /logs/batch request
+    HTTP_BATCH_LOGS = 64
+    # Rate limiter tick in seconds
+    TICK = 0.01
+    # Kernel send buffer for the TCP connection
+    TCP_SEND_BUFFER = 1 << 20
+    
     def __init__(self, host="localhost"):
         self.host = os.environ.get("LOG_AGGREGATOR_HOST", host)
         self.http_url = f"http://{self.host}:8000"
@@ -27,92 +120,105 @@ class LogGenerator:
         self.users = ["alice", "bob", "charlie", "diana", "eve"]
         self.actions = ["login", "logout", "create", "update", "delete", "read"]
         self.endpoints = ["/api/users", "/api/products", "/api/orders", "/api/reports"]
+        
+        # Keep-alive HTTP connections and one long-lived socket per
+        # protocol, instead of a new connection for every log
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+        self._tcp_sock = None
+        self._tcp_lines = []
+        self._tcp_buf_size = 0
+        self._http_batch = []
+        self._udp_sock = None
+        self.sent = 0
+        self.errors = 0
+        # (second, syslog timestamp, Apache timestamp)
+        self._ts_cache = (0, "", "")
+    
+    def _timestamps(self):
+        """Return the syslog and Apache timestamps, formatted once per second."""
+        now_s = int(time.time())
+        if now_s != self._ts_cache[0]:
+            now = datetime.fromtimestamp(now_s, timezone.utc)
+            self._ts_cache = (
+                now_s,
+                now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                now.strftime("%d/%b/%Y:%H:%M:%S +0000")
+            )
+        return self._ts_cache[1], self._ts_cache[2]
+    
+    def generate_json_records(self, k):
+        """Generate k JSON log records, sampling each field for all k at once."""
+        now = time.time()
+        records = []
+        for level, source, user, action, duration_ms in zip(
+            random.choices(LEVELS, cum_weights=LEVEL_CUM_WEIGHTS, k=k),
+            random.choices(self.sources, k=k),
+            random.choices(self.users, k=k),
+            random.choices(self.actions, k=k),
+            random.choices(DURATIONS_MS, k=k)
+        ):
+            log = {
+                "timestamp": now,
+                "level": level,
+                "source": source,
+                "message": random.choice(MESSAGES[level]),
+                "user": user,
+                "action": action,
+                "duration_ms": duration_ms,
+                "status": "success" if level == "INFO" or level == "DEBUG" else "failure"
+            }
+            
+            if level == "ERROR":
+                log["error_code"] = random.choice(ERROR_CODES)
+                log["stack_trace"] = "Exception in module.function at line 123"
+            
+            records.append(log)
+        return records
     
     def generate_json_log(self):
         """Generate a JSON format log."""
-        level = random.choices(
-            ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-            weights=[10, 60, 20, 8, 2]
-        )[0]
-        
-        log = {
-            "timestamp": time.time(),
-            "level": level,
-            "source": random.choice(self.sources),
-            "message": self._generate_message(level),
-            "user": random.choice(self.users),
-            "action": random.choice(self.actions),
-            "duration_ms": random.randint(10, 5000),
-            "status": "success" if level in ["DEBUG", "INFO"] else "failure"
-        }
-        
-        if level == "ERROR":
-            log["error_code"] = random.choice(["E001", "E002", "E003"])
-            log["stack_trace"] = "Exception in module.function at line 123"
-        
-        return json.dumps(log)
+        return dumps_json(self.generate_json_records(1)[0])
+    
+    def generate_syslogs(self, k):
+        """Generate k syslog format messages."""
+        timestamp = self._timestamps()[0]
+        return [
+            f"<{SYSLOG_FACILITY * 8 + severity}>1 {timestamp} {hostname} {app} {pid} - "
+            f"{self._generate_message_by_severity(severity)}"
+            for severity, hostname, app, pid in zip(
+                random.choices(range(8), k=k),
+                random.choices(SYSLOG_HOSTS, k=k),
+                random.choices(SYSLOG_APPS, k=k),
+                random.choices(SYSLOG_PIDS, k=k)
+            )
+        ]
     
     def generate_syslog(self):
         """Generate a syslog format message."""
-        facility = 16  # Local0
-        severity = random.randint(0, 7)
-        priority = facility * 8 + severity
-        
-        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        hostname = f"server-{random.randint(1, 10)}.example.com"
-        app = random.choice(["nginx", "mysql", "redis", "app"])
-        pid = random.randint(1000, 9999)
-        
-        message = self._generate_message_by_severity(severity)
-        
-        return f"<{priority}>1 {timestamp} {hostname} {app} {pid} - {message}"
+        return self.generate_syslogs(1)[0]
+    
+    def generate_apache_logs(self, k):
+        """Generate k Apache/Nginx access log lines."""
+        timestamp = self._timestamps()[1]
+        return [
+            f'{ip} - - [{timestamp}] "{method} {endpoint} HTTP/1.1" {status} {size}'
+            for ip, method, endpoint, status, size in zip(
+                random.choices(IP_POOL, k=k),
+                random.choices(HTTP_METHODS, k=k),
+                random.choices(self.endpoints, k=k),
+                random.choices(HTTP_STATUSES, cum_weights=HTTP_STATUS_CUM_WEIGHTS, k=k),
+                random.choices(RESPONSE_SIZES, k=k)
+            )
+        ]
     
     def generate_apache_log(self):
         """Generate Apache/Nginx access log format."""
-        ip = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
-        timestamp = datetime.now().strftime("%d/%b/%Y:%H:%M:%S +0000")
-        method = random.choice(["GET", "POST", "PUT", "DELETE"])
-        endpoint = random.choice(self.endpoints)
-        protocol = "HTTP/1.1"
-        status = random.choices([200, 201, 400, 404, 500], weights=[60, 10, 10, 15, 5])[0]
-        size = random.randint(100, 100000)
-        
-        return f'{ip} - - [{timestamp}] "{method} {endpoint} {protocol}" {status} {size}'
+        return self.generate_apache_logs(1)[0]
     
     def _generate_message(self, level):
         """Generate a message based on level."""
-        messages = {
-            "DEBUG": [
-                "Entering function process_request",
-                "Cache hit for key: user_123",
-                "SQL query executed in 23ms"
-            ],
-            "INFO": [
-                "User login successful",
-                "Order processed successfully",
-                "Database connection established",
-                "Cache warmed up"
-            ],
-            "WARNING": [
-                "High memory usage detected: 85%",
-                "Slow query detected: 5.2s",
-                "Rate limit approaching for user",
-                "Deprecated API endpoint called"
-            ],
-            "ERROR": [
-                "Failed to connect to database",
-                "Invalid authentication token",
-                "Payment processing failed",
-                "File not found: config.yml"
-            ],
-            "CRITICAL": [
-                "System out of memory",
-                "Database connection pool exhausted",
-                "Disk space critical: 95% full",
-                "Security breach detected"
-            ]
-        }
-        return random.choice(messages.get(level, ["Unknown event"]))
+        return random.choice(MESSAGES.get(level, ["Unknown event"]))
     
     def _generate_message_by_severity(self, severity):
         """Generate message based on syslog severity."""
@@ -126,90 +232,179 @@ class LogGenerator:
             return "Normal operation"
     
     def send_http_log(self, log_data):
-        """Send log via HTTP API."""
+        """Queue log for the HTTP API, sending a batch when enough are queued.
+        
+        Returns the number of logs that failed to send (a whole batch when
+        its request fails).
+        """
+        if isinstance(log_data, str):
+            # Parse JSON string
+            log_data = json.loads(log_data)
+        self._http_batch.append(log_data)
+        if len(self._http_batch) >= self.HTTP_BATCH_LOGS:
+            return self.flush_http()
+        return 0
+    
+    def flush_http(self):
+        """Send queued HTTP logs in one /logs/batch request; return the failures."""
+        if not self._http_batch:
+            return 0
+        batch, self._http_batch = self._http_batch, []
         try:
-            if isinstance(log_data, str):
-                # Parse JSON string
-                log_obj = json.loads(log_data)
-            else:
-                log_obj = log_data
-            
-            response = requests.post(
-                f"{self.http_url}/logs",
-                json=log_obj,
+            response = self.session.post(
+                f"{self.http_url}/logs/batch",
+                data=dumps_json(batch),
+                headers=JSON_HEADERS,
                 timeout=5
             )
-            return response.status_code == 200
+            return 0 if response.status_code == 200 else len(batch)
         except Exception as e:
             print(f"HTTP send error: {e}")
-            return False
+            return len(batch)
+    
+    def _tune_tcp_sock(self, sock):
+        """Set up a TCP socket for batched writes."""
+        # Each write is already a whole batch, so Nagle would only hold the
+        # tail of one back for up to 40 ms waiting on an ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Let the kernel take several batches without sendall blocking
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.TCP_SEND_BUFFER)
+    
+    def _get_tcp_sock(self):
+        """Return the TCP connection to the aggregator, connecting if needed."""
+        if self._tcp_sock is None:
+            sock = socket.create_connection((self.host, self.tcp_port), timeout=5)
+            self._tune_tcp_sock(sock)
+            self._tcp_sock = sock
+        return self._tcp_sock
     
     def send_tcp_log(self, log_data):
-        """Send log via TCP."""
+        """Queue log for TCP, writing the buffer when it is full.
+        
+        Returns the number of logs that failed to send (a whole batch when
+        its write fails).
+        """
+        self._tcp_lines.append(log_data)
+        # Characters, which is bytes for the ASCII logs generated here
+        self._tcp_buf_size += len(log_data) + 1
+        if (self._tcp_buf_size >= self.TCP_BATCH_BYTES
+                or len(self._tcp_lines) >= self.TCP_BATCH_LINES):
+            return self.flush_tcp()
+        return 0
+    
+    def flush_tcp(self):
+        """Write all buffered TCP lines with one sendall; return the failures."""
+        if not self._tcp_lines:
+            return 0
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.connect((self.host, self.tcp_port))
-                sock.send(f"{log_data}\n".encode())
-            return True
+            # One join and one encode per batch beats encoding line by line
+            self._get_tcp_sock().sendall(("\n".join(self._tcp_lines) + "\n").encode())
+            return 0
         except Exception as e:
             print(f"TCP send error: {e}")
-            return False
+            # Reconnect on the next send
+            if self._tcp_sock is not None:
+                self._tcp_sock.close()
+                self._tcp_sock = None
+            return len(self._tcp_lines)
+        finally:
+            self._tcp_lines.clear()
+            self._tcp_buf_size = 0
+    
+    def _get_udp_sock(self):
+        """Return the UDP socket, connected to the aggregator on first use."""
+        if self._udp_sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # A connected socket skips the per-datagram address lookup
+            sock.connect((self.host, self.udp_port))
+            self._udp_sock = sock
+        return self._udp_sock
     
     def send_udp_log(self, log_data):
         """Send log via UDP (syslog)."""
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                sock.sendto(log_data.encode(), (self.host, self.udp_port))
+            self._get_udp_sock().send(log_data.encode())
             return True
         except Exception as e:
             print(f"UDP send error: {e}")
             return False
     
-    def run_test(self, duration=60, rate=100):
+    def _send_burst(self, n):
+        """Generate n logs of random types and send them; return the failures."""
+        kinds = random.choices(SEND_KINDS, SEND_KIND_WEIGHTS, k=n)
+        failures = 0
+        for record in self.generate_json_records(kinds.count("json_http")):
+            failures += self.send_http_log(record)
+        for record in self.generate_json_records(kinds.count("json_tcp")):
+            failures += self.send_tcp_log(dumps_json(record))
+        for log_data in self.generate_syslogs(kinds.count("syslog")):
+            failures += not self.send_udp_log(log_data)
+        for log_data in self.generate_apache_logs(kinds.count("apache")):
+            failures += self.send_tcp_log(log_data)
+        
+        # Don't hold a partial batch across ticks
+        failures += self.flush_tcp()
+        failures += self.flush_http()
+        return failures
+    
+    def _run_loop(self, duration, rate):
+        """Send logs at rate for duration, counting into sent/errors."""
+        # Token bucket: release rate * TICK logs every tick instead of
+        # sleeping after each log, so high rates are not bound by timer
+        # granularity and the TCP/HTTP batches have something to group
+        tokens_per_tick = rate * self.TICK
+        tokens = 0.0
+        next_tick = time.monotonic()
+        end = next_tick + duration
+        now = next_tick
+        
+        # A sender that falls behind catches up, but stops on time
+        while now < end:
+            tokens += tokens_per_tick
+            burst = int(tokens)
+            tokens -= burst
+            
+            # Each burst is flushed before it returns, so every log is
+            # counted once, as sent or as failed
+            failures = self._send_burst(burst)
+            self.sent += burst - failures
+            self.errors += failures
+            
+            next_tick += self.TICK
+            now = time.monotonic()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+    
+    def run_test(self, duration=60, rate=100, workers=1):
         """Run test for specified duration and rate."""
         print(f"Starting log generation test...")
         print(f"Target: {self.host}")
         print(f"Duration: {duration}s")
         print(f"Rate: {rate} logs/second")
+        print(f"Workers: {workers}")
         
-        start_time = time.time()
-        sent_count = 0
-        error_count = 0
+        # Each worker gets its own generator, and so its own HTTP session,
+        # sockets and batches; sends block in socket calls with the GIL
+        # released, so workers overlap their round trips
+        senders = [self] + [LogGenerator(self.host) for _ in range(workers - 1)]
+        for sender in senders:
+            sender.sent = 0
+            sender.errors = 0
         
-        while time.time() - start_time < duration:
-            # Generate different types of logs
-            log_type = random.choice(["json", "syslog", "apache"])
-            
-            if log_type == "json":
-                log_data = self.generate_json_log()
-                protocol = random.choice(["http", "tcp"])
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(s._run_loop, duration, rate / workers)
+                       for s in senders}
+            while pending:
+                _, pending = wait(pending, timeout=1.0)
                 
-                if protocol == "http":
-                    success = self.send_http_log(log_data)
-                else:
-                    success = self.send_tcp_log(log_data)
-            
-            elif log_type == "syslog":
-                log_data = self.generate_syslog()
-                success = self.send_udp_log(log_data)
-            
-            else:  # apache
-                log_data = self.generate_apache_log()
-                success = self.send_tcp_log(log_data)
-            
-            if success:
-                sent_count += 1
-            else:
-                error_count += 1
-            
-            # Rate limiting
-            time.sleep(1.0 / rate)
-            
-            # Print progress
-            if sent_count % 100 == 0:
+                # Print progress
+                sent_count = sum(s.sent for s in senders)
+                error_count = sum(s.errors for s in senders)
                 elapsed = time.time() - start_time
                 actual_rate = sent_count / elapsed if elapsed > 0 else 0
-                print(f"Sent: {sent_count}, Errors: {error_count}, Rate: {actual_rate:.1f}/s")
+                if pending:
+                    print(f"Sent: {sent_count}, Errors: {error_count}, Rate: {actual_rate:.1f}/s")
         
         # Final stats
         elapsed = time.time() - start_time
@@ -220,7 +415,7 @@ class LogGenerator:
         
         # Query stats from API
         try:
-            response = requests.get(f"{self.http_url}/stats")
+            response = self.session.get(f"{self.http_url}/stats")
             if response.status_code == 200:
                 stats = response.json()
                 print(f"\nPipeline stats:")
@@ -231,13 +426,116 @@ class LogGenerator:
         except Exception as e:
             print(f"Failed to get stats: {e}")
     
+    async def _post_batch_async(self, session, semaphore, batch):
+        """Send one /logs/batch request, counting its logs as sent or failed."""
+        ok = False
+        async with semaphore:
+            try:
+                async with session.post(f"{self.http_url}/logs/batch", json=batch) as response:
+                    await response.read()
+                    ok = response.status == 200
+            except Exception as e:
+                print(f"HTTP send error: {e}")
+        if ok:
+            self.sent += len(batch)
+        else:
+            self.errors += len(batch)
+    
+    async def run_test_async(self, duration=60, rate=100, concurrency=64):
+        """Run test on one event loop with overlapping HTTP requests."""
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for the async client")
+        
+        print(f"Starting async log generation test...")
+        print(f"Target: {self.host}")
+        print(f"Duration: {duration}s")
+        print(f"Rate: {rate} logs/second")
+        print(f"Concurrency: {concurrency}")
+        
+        loop = asyncio.get_running_loop()
+        self.sent = 0
+        self.errors = 0
+        
+        reader, writer = await asyncio.open_connection(self.host, self.tcp_port)
+        self._tune_tcp_sock(writer.transport.get_extra_info("socket"))
+        udp, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(self.host, self.udp_port))
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        posts = set()
+        connector = aiohttp.TCPConnector(limit=200, ttl_dns_cache=300)
+        
+        start_time = time.time()
+        async with aiohttp.ClientSession(
+                connector=connector, json_serialize=dumps_json) as session:
+            # Same token bucket as _run_loop, but a tick's HTTP batches go
+            # out as tasks and overlap instead of waiting on each other
+            tokens_per_tick = rate * self.TICK
+            tokens = 0.0
+            next_tick = loop.time()
+            end = next_tick + duration
+            next_report = next_tick + 1.0
+            now = next_tick
+            
+            while now < end:
+                tokens += tokens_per_tick
+                burst = int(tokens)
+                tokens -= burst
+                
+                kinds = random.choices(SEND_KINDS, SEND_KIND_WEIGHTS, k=burst)
+                http_records = self.generate_json_records(kinds.count("json_http"))
+                for i in range(0, len(http_records), self.HTTP_BATCH_LOGS):
+                    batch = http_records[i:i + self.HTTP_BATCH_LOGS]
+                    posts.add(asyncio.create_task(
+                        self._post_batch_async(session, semaphore, batch)))
+                for log_data in self.generate_syslogs(kinds.count("syslog")):
+                    udp.sendto(log_data.encode())
+                tcp_lines = [dumps_json(record) for record in
+                             self.generate_json_records(kinds.count("json_tcp"))]
+                tcp_lines += self.generate_apache_logs(kinds.count("apache"))
+                # HTTP logs are counted when their request completes
+                self.sent += burst - len(http_records) - len(tcp_lines)
+                
+                if tcp_lines:
+                    try:
+                        writer.write(("\n".join(tcp_lines) + "\n").encode())
+                        await writer.drain()
+                        self.sent += len(tcp_lines)
+                    except Exception as e:
+                        print(f"TCP send error: {e}")
+                        self.errors += len(tcp_lines)
+                posts = {task for task in posts if not task.done()}
+                
+                next_tick += self.TICK
+                now = loop.time()
+                if now < next_tick:
+                    await asyncio.sleep(next_tick - now)
+                
+                # Print progress
+                if now >= next_report:
+                    next_report += 1.0
+                    elapsed = time.time() - start_time
+                    print(f"Sent: {self.sent}, Errors: {self.errors}, Rate: {self.sent / elapsed:.1f}/s")
+            
+            if posts:
+                await asyncio.wait(posts)
+        
+        writer.close()
+        udp.close()
+        
+        elapsed = time.time() - start_time
+        print(f"\nTest completed!")
+        print(f"Total sent: {self.sent}")
+        print(f"Total errors: {self.errors}")
+        print(f"Average rate: {self.sent/elapsed:.1f} logs/second")
+    
     def run_query_test(self):
         """Test query functionality."""
         print("\nTesting query functionality...")
         
         try:
             # Test basic query
-            response = requests.get(
+            response = self.session.get(
                 f"{self.http_url}/logs/query",
                 params={"limit": 10}
             )
@@ -246,7 +544,7 @@ class LogGenerator:
                 print(f"Retrieved {len(logs)} recent logs")
             
             # Test filtered query
-            response = requests.get(
+            response = self.session.get(
                 f"{self.http_url}/logs/query",
                 params={"level": "ERROR", "limit": 10}
             )
@@ -255,7 +553,7 @@ class LogGenerator:
                 print(f"Found {len(logs)} ERROR logs")
             
             # Test aggregation
-            response = requests.post(
+            response = self.session.post(
                 f"{self.http_url}/logs/aggregate",
                 json={
                     "group_by": "level",
@@ -268,7 +566,7 @@ class LogGenerator:
                 print(f"Aggregation results: {result.get('results', {})}")
             
             # Test alerts
-            response = requests.get(f"{self.http_url}/alerts/recent")
+            response = self.session.get(f"{self.http_url}/alerts/recent")
             if response.status_code == 200:
                 alerts = response.json()
                 print(f"Recent alerts: {len(alerts)}")
@@ -285,6 +583,11 @@ def main():
     parser.add_argument("--host", default="localhost", help="Aggregator host")
     parser.add_argument("--duration", type=int, default=60, help="Test duration in seconds")
     parser.add_argument("--rate", type=int, default=100, help="Logs per second")
+    parser.add_argument("--workers", type=int, default=1, help="Sender threads")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Send from one asyncio event loop (requires aiohttp)")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="In-flight HTTP requests in async mode")
     parser.add_argument("--test-queries", action="store_true", help="Test query functionality")
     
     args = parser.parse_args()
@@ -293,18 +596,25 @@ def main():
     
     # Wait for service to be ready
     print("Waiting for service to be ready...")
-    for i in range(30):
+    # Poll quickly at first and back off to once a second, for up to 30s
+    delay = 0.05
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
         try:
-            response = requests.get(f"http://{args.host}:8000/health")
+            response = generator.session.get(f"{generator.http_url}/health", timeout=1)
             if response.status_code == 200:
                 print("Service is ready!")
                 break
-        except:
+        except requests.RequestException:
             pass
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(1.0, delay * 2)
     
     # Run test
-    generator.run_test(args.duration, args.rate)
+    if args.use_async:
+        asyncio.run(generator.run_test_async(args.duration, args.rate, args.concurrency))
+    else:
+        generator.run_test(args.duration, args.rate, args.workers)
     
     # Test queries if requested
     if args.test_queries:
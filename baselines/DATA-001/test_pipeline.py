@@ -275,6 +275,32 @@ class TestLogStorage(unittest.TestCase):
         results = self.storage.query(search="Error")
         self.assertEqual(len(results), 1)
     
+    def test_query_mixed_timestamps_across_days(self):
+        """Test merging day partitions whose timestamps mix types."""
+        now = time.time()
+        for timestamp, created_at in [
+            ("2023-01-01T12:00:00Z", now - 86400),
+            (None, now - 86400),
+            (now, now),
+            ("2023-01-02T12:00:00Z", now),
+        ]:
+            log = LogEntry(
+                timestamp=timestamp,
+                source="test",
+                level="INFO",
+                message="Test message",
+                fields={},
+                raw="test"
+            )
+            self.storage.store(log, created_at=created_at)
+        
+        # Ordered like SQLite: text after numbers, NULL last when descending
+        results = self.storage.query()
+        self.assertEqual(
+            [result["timestamp"] for result in results],
+            ["2023-01-02T12:00:00Z", "2023-01-01T12:00:00Z", now, None]
+        )
+    
     def test_retention_policy(self):
         """Test retention policy application."""
         # Store old log
@@ -361,6 +387,35 @@ class TestLogPipeline(unittest.TestCase):
         # Check error count
         error_results = self.pipeline.storage.query(level="ERROR")
         self.assertEqual(len(error_results), 100)  # 10% should be errors
+    
+    def test_batch_volume(self):
+        """Test processing high volume of logs as one batch."""
+        # Keep these rows out of the shared database file
+        self.pipeline.storage = LogStorage(":memory:")
+        records = [
+            (json.dumps({
+                "timestamp": time.time(),
+                "level": "info" if i % 10 != 0 else "error",
+                "message": f"Log {i}",
+                "index": i
+            }), "test")
+            for i in range(1000)
+        ]
+        
+        # Parsed logs are stored with one write
+        failed = self.pipeline.process_logs(records)
+        self.assertEqual(failed, [])
+        
+        # Check stats
+        stats = self.pipeline.get_stats()
+        self.assertEqual(stats["total_logs"], 1000)
+        self.assertEqual(stats["errors"], 0)
+        
+        # Check storage
+        results = self.pipeline.storage.query(limit=10000)
+        self.assertEqual(len(results), 1000)
+        error_results = self.pipeline.storage.query(level="ERROR")
+        self.assertEqual(len(error_results), 100)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,11 @@
 """REST API server for stream processing"""
 import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Dict, Any, List
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
 from stream_processor import StreamProcessor
@@ -12,6 +13,9 @@ from models import Pipeline
 
 logger = logging.getLogger(__name__)
 
+# Seconds a formatted response timestamp is reused before reformatting
+TIMESTAMP_RESOLUTION = 0.1
+
 
 class APIServer:
     """REST API for monitoring and controlling stream processing"""
@@ -22,11 +26,24 @@ class APIServer:
         self.app = FastAPI(
             title="Stream Processing API",
             description="Monitor and control stream processing pipelines",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse
         )
         
+        # Coarse response timestamp and the monotonic time it goes stale
+        self._timestamp = ""
+        self._timestamp_expires = 0.0
+        
         self._setup_routes()
     
+    def _now_iso(self) -> str:
+        """Current UTC time in ISO format, reformatted at most every 100 ms"""
+        now = time.monotonic()
+        if now >= self._timestamp_expires:
+            self._timestamp = datetime.utcnow().isoformat()
+            self._timestamp_expires = now + TIMESTAMP_RESOLUTION
+        return self._timestamp
+    
     def _setup_routes(self):
         """Setup API routes"""
         
@@ -35,7 +52,7 @@ class APIServer:
             """Health check endpoint"""
             return {
                 "status": "healthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": self._now_iso(),
                 "processor_running": self.stream_processor.running
             }
         
@@ -47,7 +64,7 @@ class APIServer:
                 return {
                     "status": "running" if self.stream_processor.running else "stopped",
                     "stats": stats,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": self._now_iso()
                 }
             except Exception as e:
                 logger.error(f"Status error: {e}")
@@ -125,11 +142,10 @@ class APIServer:
                 watermarks = await self.stream_processor.watermark_tracker.get_all_watermarks()
                 global_wm = await self.stream_processor.watermark_tracker.get_global_watermark()
                 
+                # Datetimes are rendered as ISO strings by the response encoder
                 return {
-                    "watermarks": {
-                        k: v.isoformat() for k, v in watermarks.items()
-                    },
-                    "global_watermark": global_wm.isoformat() if global_wm else None,
+                    "watermarks": watermarks,
+                    "global_watermark": global_wm,
                     "stats": self.stream_processor.watermark_tracker.get_stats()
                 }
             except Exception as e:
@@ -153,7 +169,7 @@ class APIServer:
                 checkpoint = await self.stream_processor.create_checkpoint()
                 return {
                     "message": "Checkpoint created",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": self._now_iso(),
                     "checkpoint_size": len(checkpoint)
                 }
             except Exception as e:
@@ -187,8 +203,8 @@ class APIServer:
                             windows.append({
                                 "pipeline_id": pid,
                                 "window_id": window_id,
-                                "start_time": window.start_time.isoformat(),
-                                "end_time": window.end_time.isoformat(),
+                                "start_time": window.start_time,
+                                "end_time": window.end_time,
                                 "event_count": len(window.events),
                                 "state": window.state
                             })
@@ -203,11 +219,18 @@ class APIServer:
     
     async def start(self):
         """Start the API server"""
+        # serve() runs on the application's loop, which main() sets up
+        # with uvloop; no websocket routes or lifespan hooks, and no
+        # per-request access log line
         config = uvicorn.Config(
             self.app,
             host=self.config.api_host,
             port=self.config.api_port,
-            log_level="info"
+            log_level="info",
+            http="httptools",
+            ws="none",
+            lifespan="off",
+            access_log=False
         )
         
         self.server = uvicorn.Server(config)
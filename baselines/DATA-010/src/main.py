@@ -7,6 +7,12 @@ import logging
 import signal
 from typing import Optional
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from stream_processor import StreamProcessor
 from config import StreamConfig
 from api_server import APIServer
@@ -92,6 +98,10 @@ def main():
     
     args = parser.parse_args()
     
+    # The API server runs on this loop, so choose uvloop before it exists
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+    
     # Create and run application
     app = StreamProcessingApplication(config_path=args.config)
     